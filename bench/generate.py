@@ -0,0 +1,100 @@
+# bench/generate.py
+"""
+Synthetic workout logs for benchmarking.
+
+Sessions follow the real ROUTINES from logger.py; every exercise comes
+from EXERCISE_LIBRARY. Each athlete trains a push → pull → core cycle
+on random days spread over the requested number of years.
+
+    python -m bench.generate 1000000 big_log.csv --athletes 50 --years 3
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from logger import ROUTINES
+from engine.config import EXERCISE_LIBRARY
+
+ROUTINE_NAMES = list(ROUTINES)
+
+# probability that a routine exercise is performed in a given session
+KEEP_PROBABILITY = 0.75
+
+
+def generate_log(rows, athletes=1, years=2, start="2020-01-01", seed=0):
+    """
+    Returns a log DataFrame with exactly `rows` rows:
+    athlete | date | routine | exercise | sets | reps
+    """
+    rng = np.random.default_rng(seed)
+
+    exercise_names = np.array(list(EXERCISE_LIBRARY))
+    exercise_code = {ex: i for i, ex in enumerate(exercise_names)}
+    routine_codes = [
+        np.array([exercise_code[ex] for ex in ROUTINES[r]])
+        for r in ROUTINE_NAMES
+    ]
+
+    mean_per_session = KEEP_PROBABILITY * np.mean([len(c) for c in routine_codes])
+    sessions = int(np.ceil(rows / mean_per_session * 1.1)) + len(ROUTINE_NAMES)
+    per_athlete = int(np.ceil(sessions / athletes))
+
+    # session table: athlete, day offset, routine (cycling)
+    athlete = np.repeat(np.arange(athletes), per_athlete)
+    day = np.sort(
+        rng.integers(0, years * 365, size=(athletes, per_athlete)), axis=1
+    ).ravel()
+    routine = np.tile(np.arange(per_athlete) % len(ROUTINE_NAMES), athletes)
+    routine = (routine + athlete) % len(ROUTINE_NAMES)
+
+    # expand each session to its routine's exercise list
+    session_ids = []
+    exercise_ids = []
+
+    for r, codes in enumerate(routine_codes):
+        ids = np.flatnonzero(routine == r)
+        session_ids.append(np.repeat(ids, len(codes)))
+        exercise_ids.append(np.tile(codes, len(ids)))
+
+    session_ids = np.concatenate(session_ids)
+    exercise_ids = np.concatenate(exercise_ids)
+
+    keep = rng.random(len(session_ids)) < KEEP_PROBABILITY
+    session_ids = session_ids[keep]
+    exercise_ids = exercise_ids[keep]
+
+    # drop surplus rows at random, then order by session
+    chosen = np.sort(rng.choice(len(session_ids), size=rows, replace=False))
+    order = chosen[np.argsort(session_ids[chosen], kind="stable")]
+    session_ids = session_ids[order]
+    exercise_ids = exercise_ids[order]
+
+    athlete_ids = np.array([f"athlete-{a:04d}" for a in range(athletes)])
+    dates = pd.Timestamp(start) + pd.to_timedelta(day[session_ids], unit="D")
+
+    return pd.DataFrame({
+        "athlete": athlete_ids[athlete[session_ids]],
+        "date": dates,
+        "routine": np.array(ROUTINE_NAMES)[routine[session_ids]],
+        "exercise": exercise_names[exercise_ids],
+        "sets": rng.integers(2, 6, size=len(session_ids)),
+        "reps": rng.integers(5, 16, size=len(session_ids)),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic workout log")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--athletes", type=int, default=1)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    log_df = generate_log(args.rows, args.athletes, args.years, seed=args.seed)
+    log_df.to_csv(args.path, index=False, date_format="%Y-%m-%d")
+    print(f"Wrote {len(log_df)} rows → {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# bench/load.py
+"""
+Load test for the HTTP analytics service (server.py).
+
+Without --url, writes a synthetic log to a scratch directory, starts
+server.py on a free port and, after the run, appends a session to
+check that the next response reflects it (cache invalidation). Client
+processes hold keep-alive connections and cycle through a mix of
+endpoints (whole-history and date-ranged queries) for --duration
+seconds; requests per second and latency percentiles are reported
+overall and per endpoint. Exits 1 on any failed request, a failed
+invalidation check or a p99 over --p99-budget-ms.
+
+    python -m bench.load --rows 100000 --connections 32 --duration 10
+    python -m bench.load --url http://127.0.0.1:8765 --duration 10
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from urllib.parse import urlsplit
+import numpy as np
+import pandas as pd
+
+from bench.generate import generate_log
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    "/tier1",
+    "/coverage",
+    "/readiness",
+    "/aggregate?window=weekly",
+    "/aggregate?window=monthly",
+    "/push-pull",
+    "/progress",
+    "/tier1?start=2021-01-01&end=2021-06-30",
+    "/aggregate?window=monthly&start=2021-01-01",
+]
+
+
+# ==============================
+# CLIENT
+# ==============================
+
+async def _get(reader, writer, host, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+
+    return status, await reader.readexactly(length)
+
+
+async def fetch(url, target):
+    """
+    One request on a fresh connection: (status, body).
+    """
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+    try:
+        return await _get(reader, writer, parts.hostname, target)
+    finally:
+        writer.close()
+
+
+async def _connection(host, port, offset, deadline, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+
+    try:
+        while time.perf_counter() < deadline:
+            target = TARGETS[i % len(TARGETS)]
+            start = time.perf_counter()
+            status, _ = await _get(reader, writer, host, target)
+            results.append((i % len(TARGETS), status, time.perf_counter() - start))
+            i += 1
+    finally:
+        writer.close()
+
+
+async def _run_clients(url, connections, first, duration):
+    parts = urlsplit(url)
+    deadline = time.perf_counter() + duration
+    results = []
+
+    await asyncio.gather(*[
+        _connection(parts.hostname, parts.port, first + c, deadline, results)
+        for c in range(connections)
+    ])
+    return results
+
+
+def _client_process(url, connections, first, duration):
+    return asyncio.run(_run_clients(url, connections, first, duration))
+
+
+def run_load(url, connections, processes, duration):
+    """
+    Returns (elapsed seconds, endpoint index, status, latency) arrays.
+    """
+    shares = [len(range(p, connections, processes)) for p in range(processes)]
+    firsts = np.concatenate([[0], np.cumsum(shares)[:-1]])
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        parts = pool.starmap(_client_process, [
+            (url, n, int(first), duration) for n, first in zip(shares, firsts) if n
+        ])
+    elapsed = time.perf_counter() - start
+
+    results = np.array([r for part in parts for r in part], dtype=float).reshape(-1, 3)
+    return elapsed, results[:, 0].astype(int), results[:, 1].astype(int), results[:, 2]
+
+
+# ==============================
+# REPORT
+# ==============================
+
+def report(elapsed, endpoints, statuses, latencies):
+    ms = latencies * 1000
+    failed = int((statuses != 200).sum())
+
+    print(f"{len(ms)} requests in {elapsed:.1f}s: {len(ms) / elapsed:,.0f} req/s, {failed} failed")
+    print(
+        f"latency ms  p50 {np.percentile(ms, 50):.2f}  p90 {np.percentile(ms, 90):.2f}  "
+        f"p99 {np.percentile(ms, 99):.2f}  max {ms.max():.2f}"
+    )
+
+    rows = []
+    for i, target in enumerate(TARGETS):
+        mine = ms[endpoints == i]
+        if len(mine):
+            rows.append({
+                "endpoint": target,
+                "requests": len(mine),
+                "p50 ms": round(float(np.percentile(mine, 50)), 2),
+                "p99 ms": round(float(np.percentile(mine, 99)), 2),
+            })
+    print(pd.DataFrame(rows).to_string(index=False))
+
+    return failed, float(np.percentile(ms, 99))
+
+
+# ==============================
+# LOCAL INSTANCE
+# ==============================
+
+def start_server(path):
+    proc = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(ROOT, "server.py"),
+         "--path", path, "--port", "0", "--poll", "0.5"],
+        cwd=os.path.dirname(path),
+        env={**os.environ, "PYTHONPATH": ROOT},
+        stdout=subprocess.PIPE, text=True
+    )
+
+    line = proc.stdout.readline()
+    if not line.startswith("Serving on "):
+        proc.kill()
+        raise RuntimeError(f"server.py did not start: {line!r}")
+
+    return proc, line.split()[-1]
+
+
+def check_invalidation(url, path):
+    """
+    Appends a session and checks the very next response includes it.
+    """
+    from logger import save_session
+
+    _, before = asyncio.run(fetch(url, "/push-pull"))
+
+    save_session(pd.DataFrame({
+        "date": ["2030-01-01"], "routine": ["push"],
+        "exercise": ["Push-up"], "sets": [5], "reps": [20],
+    }), path=path, summary_path=None)
+
+    start = time.perf_counter()
+    status, after = asyncio.run(fetch(url, "/push-pull"))
+    reload_ms = (time.perf_counter() - start) * 1000
+
+    ok = status == 200 and after != before
+    print(f"invalidation: {'fresh' if ok else 'STALE'} response {reload_ms:.0f} ms after the append")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP analytics service load test")
+    parser.add_argument("--url", help="existing instance; default starts one on a synthetic log")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--p99-budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    processes = max(1, min(args.processes, args.connections))
+
+    with tempfile.TemporaryDirectory() as folder:
+        proc = path = None
+        url = args.url
+
+        if url is None:
+            path = os.path.join(folder, "workout_log.csv")
+            log_df = generate_log(args.rows).drop(columns="athlete")
+            log_df.to_csv(path, index=False, date_format="%Y-%m-%d")
+
+            start = time.perf_counter()
+            proc, url = start_server(path)
+            print(f"server: {url}, {args.rows} rows, warm after {time.perf_counter() - start:.1f}s")
+
+        try:
+            elapsed, endpoints, statuses, latencies = run_load(
+                url, args.connections, processes, args.duration
+            )
+            print(f"{args.connections} keep-alive connections over {processes} client processes")
+            failed, p99 = report(elapsed, endpoints, statuses, latencies)
+
+            fresh = check_invalidation(url, path) if path else True
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+
+    ok = not failed and fresh and (args.p99_budget_ms is None or p99 <= args.p99_budget_ms)
+    print("PASS" if ok else "FAIL")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# bench/run.py
+"""
+Engine benchmark runner.
+
+Times the hot engine entry points and load_history on synthetic logs of
+increasing size and writes the results to JSON, so runs from different
+commits can be compared.
+
+    python -m bench.run --sizes 1e3,1e4,1e5,1e6 --out bench_results.json
+    python -m bench.run --compare old.json new.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+from logger import load_history
+from engine.core import compute_muscle_contribution
+from engine.aggregation import aggregate_by_sessions
+from engine.recovery import unified_muscle_readiness
+from engine.progress import routine_progress_series, BASELINE_ROUTINE
+from engine.workload import workload_series
+from bench.generate import generate_log
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def _best_of(func, repeat):
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def benchmark_size(rows, athletes, years, repeat):
+    log_df = generate_log(rows, athletes=athletes, years=years)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "workout_log.csv")
+        log_df.to_csv(path, index=False, date_format="%Y-%m-%d")
+
+        cases = {
+            "compute_muscle_contribution": lambda: compute_muscle_contribution(log_df),
+            "aggregate_by_sessions": lambda: aggregate_by_sessions(log_df, "monthly"),
+            "unified_muscle_readiness": lambda: unified_muscle_readiness(log_df),
+            "routine_progress_series": lambda: routine_progress_series(log_df, BASELINE_ROUTINE),
+            "workload_series": lambda: workload_series(log_df, level="fine"),
+            "load_history": lambda: load_history(path),
+        }
+
+        results = []
+
+        for name, func in cases.items():
+            seconds = _best_of(func, repeat)
+            results.append({"function": name, "rows": rows, "seconds": seconds})
+            print(f"{name:32s} {rows:>10,d} rows  {seconds * 1000:10.2f} ms")
+
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, athletes, years, repeat):
+    results = []
+
+    for rows in sizes:
+        results.extend(benchmark_size(rows, athletes, years, repeat))
+
+    return {
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "athletes": athletes,
+        "years": years,
+        "results": results,
+    }
+
+
+def compare(old_path, new_path, threshold=1.2):
+    """
+    Prints new/old time ratios; returns True if any case regressed
+    by more than `threshold`.
+    """
+    with open(old_path) as f:
+        old = {(r["function"], r["rows"]): r["seconds"] for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {(r["function"], r["rows"]): r["seconds"] for r in json.load(f)["results"]}
+
+    regressed = False
+
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] > 0 else float("inf")
+        flag = "  ← regression" if ratio > threshold else ""
+        regressed |= ratio > threshold
+        print(f"{key[0]:32s} {key[1]:>10,d} rows  {ratio:6.2f}x{flag}")
+
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the workout engine")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated row counts, e.g. 1e3,1e6,1e7")
+    parser.add_argument("--athletes", type=int, default=10)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    report = run(sizes, args.athletes, args.years, args.repeat)
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nResults → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
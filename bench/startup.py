@@ -0,0 +1,89 @@
+# bench/startup.py
+"""
+Time-to-first-prompt check for the logging entry points.
+
+Starts each script in a scratch directory, measures wall time until
+the first prompt ("Athlete ID") is written, and checks that quicklog
+gets there without importing pandas, NumPy or matplotlib. Exits 1 if
+quicklog misses the budget.
+
+    python -m bench.startup --runs 15 --budget-ms 100
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"Athlete ID"
+HEAVY = ("pandas", "numpy", "matplotlib")
+
+
+def time_to_prompt(script, folder):
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(ROOT, script)],
+        cwd=folder,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+
+    seen = b""
+    try:
+        while PROMPT not in seen:
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError(f"{script} exited before prompting")
+            seen += chunk
+        return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def heavy_imports(module):
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT,
+        capture_output=True, text=True, check=True
+    )
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging CLI startup time")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as folder:
+        for script in ["quicklog.py", "main.py"]:
+            try:
+                time_to_prompt(script, folder)  # warm the bytecode / page cache
+            except RuntimeError as error:
+                # main.py needs the full dependency set
+                print(f"{script:<12} skipped: {error}")
+                continue
+
+            runs = [time_to_prompt(script, folder) for _ in range(args.runs)]
+            results[script] = statistics.median(runs) * 1000
+            print(f"{script:<12} median {results[script]:7.1f} ms to first prompt")
+
+    heavy = heavy_imports("quicklog")
+    print(f"heavy modules imported by quicklog: {', '.join(heavy) or 'none'}")
+
+    ok = results["quicklog.py"] <= args.budget_ms and not heavy
+    print("PASS" if ok else f"FAIL (budget {args.budget_ms:.0f} ms)")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# bench/stress_append.py
+"""
+Concurrent-append stress test for the CSV log.
+
+Spawns several writer processes, each with a few threads, all calling
+save_session on the same log. Every row carries a unique
+(writer, sequence) pair in sets / reps, so afterwards the log is checked
+for lost, duplicated or corrupted rows. Also checks torn-tail recovery
+and header enforcement, and reports sustained appends per second.
+
+    python -m bench.stress_append --processes 8 --threads 4 --sessions 200
+"""
+import os
+import time
+import argparse
+import tempfile
+import threading
+import multiprocessing
+import pandas as pd
+
+from logger import save_session
+from storage import HeaderMismatch, append_csv, repair_csv
+
+ROWS_PER_SESSION = 5
+
+
+def _writer(path, writer_id, threads, sessions, summary_path):
+    def run(thread_id):
+        for seq in range(sessions):
+            base = (thread_id * sessions + seq) * ROWS_PER_SESSION
+            session = pd.DataFrame({
+                "date": ["2024-01-01"] * ROWS_PER_SESSION,
+                "routine": ["push"] * ROWS_PER_SESSION,
+                "exercise": ["Push-up"] * ROWS_PER_SESSION,
+                "sets": [writer_id] * ROWS_PER_SESSION,
+                "reps": range(base, base + ROWS_PER_SESSION),
+            })
+            save_session(session, path=path, summary_path=summary_path)
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+
+def check_torn_tail(folder):
+    path = os.path.join(folder, "torn.csv")
+    header = "date,routine,exercise,sets,reps\n"
+
+    def save(date):
+        save_session(pd.DataFrame({
+            "date": [date], "routine": ["pull"],
+            "exercise": ["DB Curl"], "sets": [3], "reps": [12],
+        }), path=path, summary_path=None)
+
+    # a row cut off mid-field, even one with every field present
+    for torn in ["2024-01-0", "2024-01-01,push,Push-up,3,1"]:
+        with open(path, "w") as f:
+            f.write(header + "2024-01-01,push,Push-up,3,10\n" + torn)
+
+        removed = repair_csv(path)
+        save("2024-01-02")
+
+        log_df = pd.read_csv(path)
+        assert removed == len(torn), removed
+        assert list(log_df["reps"]) == [10, 12], log_df
+
+    # a torn header is dropped and rewritten by the next append
+    with open(path, "w") as f:
+        f.write("date,routine,exer")
+    save("2024-01-03")
+
+    log_df = pd.read_csv(path)
+    assert list(log_df.columns) == header.strip().split(","), log_df
+    assert len(log_df) == 1 and log_df["reps"].notna().all(), log_df
+
+    # keeping a complete unterminated row (hand edit) takes the flag
+    with open(path, "a") as f:
+        f.write("2024-01-04,pull,DB Curl,3,10")
+
+    removed = repair_csv(path, terminate=True)
+    save("2024-01-05")
+
+    log_df = pd.read_csv(path)
+    assert removed == 0, removed
+    assert list(log_df["date"]) == ["2024-01-03", "2024-01-04", "2024-01-05"], log_df
+
+    # rows whose columns differ from the header are refused, not reindexed
+    try:
+        append_csv(path, pd.DataFrame({"date": ["2024-01-06"], "routine": ["pull"]}))
+    except HeaderMismatch:
+        pass
+    else:
+        raise AssertionError("append with missing columns was accepted")
+
+    assert len(pd.read_csv(path)) == 3
+    print("torn tail: torn rows and header dropped, mismatched columns refused")
+
+
+def run(processes, threads, sessions, with_summary):
+    with tempfile.TemporaryDirectory() as folder:
+        check_torn_tail(folder)
+
+        path = os.path.join(folder, "workout_log.csv")
+        summary = os.path.join(folder, "workout_log_sessions.csv") if with_summary else None
+
+        start = time.perf_counter()
+        procs = [
+            multiprocessing.Process(target=_writer, args=(path, p, threads, sessions, summary))
+            for p in range(processes)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        failed = [p.exitcode for p in procs if p.exitcode != 0]
+        assert not failed, f"writer processes failed: {failed}"
+
+        log_df = pd.read_csv(path)
+        expected_sessions = processes * threads * sessions
+        expected_rows = expected_sessions * ROWS_PER_SESSION
+
+        with open(path) as f:
+            headers = sum(1 for line in f if line.startswith("date,"))
+
+        pairs = log_df[["sets", "reps"]].drop_duplicates()
+
+        print(f"rows on disk: {len(log_df)} (expected {expected_rows})")
+        print(f"headers: {headers}, unique (writer, seq): {len(pairs)}")
+        print(f"corrupted rows: {int(log_df.isna().any(axis=1).sum())}")
+        print(f"{expected_sessions / elapsed:,.0f} appends/s "
+              f"({expected_rows / elapsed:,.0f} rows/s) over {elapsed:.2f}s")
+
+        ok = (
+            len(log_df) == expected_rows
+            and len(pairs) == expected_rows
+            and headers == 1
+            and not log_df.isna().any().any()
+        )
+        print("PASS" if ok else "FAIL")
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent save_session stress test")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=100, help="per thread")
+    parser.add_argument("--summary", action="store_true", help="also maintain the summary table")
+    args = parser.parse_args()
+
+    ok = run(args.processes, args.threads, args.sessions, args.summary)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# cache.py
+"""
+Content-keyed memoization for the dashboard.
+
+Streamlit re-executes the whole script on every widget change, so
+caches live here (an imported module survives reruns) and are looked
+up by the decorated function's qualified name.
+
+Keys combine a fingerprint of the log on disk (size, mtime, content
+hash) with the call arguments; each function keeps a bounded LRU.
+"""
+import os
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+_CACHES = {}
+_DIGESTS = {}
+
+
+class LRUCache:
+    """
+    Bounded by entry count and, optionally, by total value size
+    (maxbytes, measured with sizeof). Thread-safe: Streamlit runs
+    sessions on separate threads that share these caches.
+    """
+
+    def __init__(self, maxsize=32, maxbytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+
+        with self.lock:
+            if self.maxbytes is not None:
+                if key in self.entries:
+                    self.nbytes -= self.sizeof(self.entries[key])
+                self.nbytes += size
+
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize or self._over_budget():
+                self._evict()
+
+    def _over_budget(self):
+        return (
+            self.maxbytes is not None
+            and self.nbytes > self.maxbytes
+            and len(self.entries) > 1
+        )
+
+    def _evict(self):
+        _, value = self.entries.popitem(last=False)
+        if self.maxbytes is not None:
+            self.nbytes -= self.sizeof(value)
+
+    def discard(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return
+
+            value = self.entries.pop(key)
+            if self.maxbytes is not None:
+                self.nbytes -= self.sizeof(value)
+
+    def keys(self):
+        """Snapshot of the keys, oldest first (safe to iterate while others write)."""
+        with self.lock:
+            return list(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """
+    (path, size, mtime, sha256) of a log file, or of every file under a
+    log directory. The content hash is only recomputed when size or
+    mtime change.
+    """
+    if not os.path.exists(path):
+        return (path, 0, 0, None)
+
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(folder, name)
+            for folder, _, names in os.walk(path)
+            for name in names
+        )
+    else:
+        files = [path]
+
+    size = mtime = 0
+    combined = hashlib.sha256()
+
+    for file in files:
+        stat = os.stat(file)
+        stamp = (file, stat.st_size, stat.st_mtime_ns)
+
+        if _DIGESTS.get(file, (None,))[0] != stamp:
+            _DIGESTS[file] = (stamp, _file_digest(file))
+
+        size += stat.st_size
+        mtime = max(mtime, stat.st_mtime_ns)
+        combined.update(_DIGESTS[file][1].encode())
+
+    return (path, size, mtime, combined.hexdigest())
+
+
+def named_cache(name, maxsize=32, **options):
+    """
+    The LRUCache registered under `name`, created on first use (so it
+    survives reruns and is emptied by clear_caches).
+    """
+    return _CACHES.setdefault(name, LRUCache(maxsize, **options))
+
+
+def memoize(maxsize=32):
+    """
+    LRU memoization keyed on hashable positional/keyword arguments.
+    Cached values are shared: callers must not mutate them.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        cache = named_cache(name, maxsize)
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            value = cache.get(key, missing)
+
+            if value is missing:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def clear_caches():
+    for cache in _CACHES.values():
+        cache.clear()
+    _DIGESTS.clear()
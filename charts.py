@@ -0,0 +1,147 @@
+# charts.py
+"""
+Headless chart rendering with a content-keyed cache.
+
+Figures are drawn on the Agg canvas (no pyplot, no GUI backend, no
+global figure registry) and returned as PNG or SVG bytes. Each render
+is keyed on a hash of everything that affects the pixels (values,
+labels, title, size, format), so identical inputs on a rerun return the
+cached bytes without touching matplotlib. The cache is bounded by total
+byte size; figures are cleared as soon as they are encoded.
+"""
+import io
+import json
+import hashlib
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from cache import named_cache
+
+RENDER_CACHE_BYTES = 32 * 1024 * 1024
+DPI = 150
+
+_renders = named_cache("charts.render", maxsize=256, maxbytes=RENDER_CACHE_BYTES)
+
+
+def _render_key(kind, **parts):
+    digest = hashlib.sha256(kind.encode())
+
+    for name in sorted(parts):
+        value = parts[name]
+        digest.update(name.encode())
+
+        if isinstance(value, np.ndarray):
+            digest.update(str(value.shape).encode())
+            digest.update(np.ascontiguousarray(value, dtype=np.float64).tobytes())
+        else:
+            digest.update(json.dumps(value, default=str).encode())
+
+    return digest.hexdigest()
+
+
+def _render(key, draw, size, fmt):
+    """
+    Cached bytes for `key`, else draw(fig) on a fresh Agg figure,
+    encode it and release the figure.
+    """
+    cached = _renders.get(key)
+    if cached is not None:
+        return cached
+
+    fig = Figure(figsize=size, dpi=DPI)
+    FigureCanvasAgg(fig)
+
+    try:
+        draw(fig)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, transparent=fig.patch.get_alpha() == 0)
+    finally:
+        fig.clear()
+
+    data = buffer.getvalue()
+    _renders.put(key, data)
+    return data
+
+
+# ===== CHARTS =====
+
+def radar_chart(labels, values, title="Muscle Balance", size=(6, 6), fmt="png"):
+    """
+    Closed polar plot of one value per label.
+    """
+    labels = [str(label) for label in labels]
+    values = np.asarray(values, dtype=float)
+
+    def draw(fig):
+        angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False)
+        closed_angles = np.append(angles, angles[:1])
+        closed_values = np.append(values, values[:1])
+
+        ax = fig.add_subplot(111, polar=True)
+        ax.plot(closed_angles, closed_values)
+        ax.fill(closed_angles, closed_values, alpha=0.25)
+        ax.set_thetagrids(np.degrees(angles), labels)
+        ax.set_title(title)
+
+    key = _render_key(
+        "radar", labels=labels, values=values, title=title, size=list(size), fmt=fmt
+    )
+    return _render(key, draw, size, fmt)
+
+
+def line_chart(series, title="", xlabel="", ylabel="", baseline=None,
+               size=(7, 4), fmt="png", dark=True):
+    """
+    One marker line per {label: values}, x = 1..n. `dark` uses the
+    transparent, light-text style of the dashboard.
+    """
+    series = {str(label): np.asarray(values, dtype=float) for label, values in series.items()}
+
+    def draw(fig):
+        ax = fig.add_subplot(111)
+
+        for label, values in series.items():
+            ax.plot(np.arange(1, len(values) + 1), values, label=label, marker="o")
+
+        if baseline is not None:
+            ax.axhline(baseline, linestyle="--", linewidth=1, alpha=0.6)
+
+        ax.grid(True, alpha=0.2)
+
+        if dark:
+            fig.patch.set_alpha(0)
+            ax.set_facecolor("none")
+            ax.set_xlabel(xlabel, color="#DDDDDD")
+            ax.set_ylabel(ylabel, color="#DDDDDD")
+            ax.set_title(title, color="#FFFFFF")
+            ax.tick_params(axis="x", colors="#CCCCCC")
+            ax.tick_params(axis="y", colors="#CCCCCC")
+        else:
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel(ylabel)
+            ax.set_title(title)
+
+        if series:
+            legend = ax.legend()
+            if dark:
+                for text in legend.get_texts():
+                    text.set_color("#DDDDDD")
+
+    key = _render_key(
+        "line",
+        labels=list(series),
+        values=[values.tolist() for values in series.values()],
+        title=title, xlabel=xlabel, ylabel=ylabel, baseline=baseline,
+        size=list(size), fmt=fmt, dark=dark
+    )
+    return _render(key, draw, size, fmt)
+
+
+def render_cache_stats():
+    return {
+        "entries": len(_renders),
+        "bytes": _renders.nbytes,
+        "hits": _renders.hits,
+        "misses": _renders.misses,
+    }
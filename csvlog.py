@@ -0,0 +1,216 @@
+# csvlog.py
+"""
+Standard-library core of the CSV log.
+
+Default log locations, per-athlete paths and the locked, torn-tail
+safe CSV append live here so the fast-start logger (quicklog.py) can
+write a session without importing pandas. storage.py builds its
+DataFrame-level append_csv / group commit on top of locked_append.
+"""
+import os
+import csv
+import io
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer assumed
+    fcntl = None
+
+CSV_PATH = "workout_log.csv"
+
+# "csv" (single file) or "parquet" (month-partitioned directory)
+STORAGE_BACKEND = "csv"
+
+DEFAULT_ATHLETE = "default"
+
+
+def summary_path_for(path):
+    """
+    Summary table of the log at `path` (a CSV file or parquet root):
+    one row per (session date, routine), maintained by save_session.
+    Named after the log and kept beside it (workout_log.csv →
+    workout_log_sessions.csv), so logs in one directory never share one.
+    """
+    path = os.path.normpath(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), f"{stem}_sessions.csv")
+
+
+SUMMARY_PATH = summary_path_for(CSV_PATH)
+
+
+def resolve_summary_path(path, summary_path="auto"):
+    """
+    summary_path arguments: "auto" → beside the log, None → no summary,
+    anything else is used as given.
+    """
+    return summary_path_for(path) if summary_path == "auto" else summary_path
+
+
+# ==============================
+# PER-ATHLETE PATHS
+# ==============================
+
+def check_athlete(athlete):
+    if not athlete or athlete.startswith(".") or "/" in athlete or os.sep in athlete:
+        raise ValueError(f"Invalid athlete id: {athlete!r}")
+
+
+def athlete_path(path, athlete=None, backend="csv"):
+    """
+    Location of one athlete's log.
+
+    csv     : <dir>/athletes/<athlete>/<file>
+    parquet : <root>/athlete=<athlete>/
+    The default athlete (None) keeps `path` itself.
+    """
+    if athlete is None or athlete == DEFAULT_ATHLETE:
+        return path
+
+    check_athlete(athlete)
+
+    if backend == "parquet":
+        return os.path.join(path, f"athlete={athlete}")
+
+    folder, name = os.path.split(path)
+    return os.path.join(folder, "athletes", athlete, name)
+
+
+# ==============================
+# LOCKED APPENDS
+# ==============================
+
+def _line_start(fd, end):
+    """
+    Offset of the line that ends at byte `end`.
+    """
+    while end > 0:
+        start = max(0, end - 65536)
+        cut = os.pread(fd, end - start, start).rfind(b"\n")
+
+        if cut >= 0:
+            return start + cut + 1
+
+        end = start
+
+    return 0
+
+
+def _field_count(line):
+    return len(next(csv.reader([line.decode(errors="replace")]), []))
+
+
+def _repair_tail(fd, terminate=False):
+    """
+    Truncates a last line with no trailing newline: every append ends
+    in "\n", so such a line is a torn write (a writer died mid-append).
+    With terminate, a last row with as many fields as the header (a
+    hand-edited file) gets its newline instead. Returns the number of
+    bytes removed.
+    """
+    size = os.fstat(fd).st_size
+    if size == 0 or os.pread(fd, 1, size - 1) == b"\n":
+        return 0
+
+    keep = _line_start(fd, size)
+
+    # a torn header (keep == 0) is never kept
+    if terminate and keep > 0:
+        tail = os.pread(fd, size - keep, keep)
+        if _field_count(tail) == len(_read_header(fd)):
+            os.pwrite(fd, b"\n", size)
+            return 0
+
+    os.ftruncate(fd, keep)
+    return size - keep
+
+
+def _read_header(fd):
+    first = os.pread(fd, 65536, 0).split(b"\n", 1)[0]
+    return first.decode().strip().split(",") if first else None
+
+
+class HeaderMismatch(ValueError):
+    """
+    Rows to append do not have the columns of the file's header.
+    """
+
+
+def check_header(header, columns):
+    """
+    Raises HeaderMismatch unless `columns` are exactly the on-disk
+    `header` (in any order), so appends never drop or blank a column.
+    """
+    if header is not None and sorted(header) != sorted(columns):
+        raise HeaderMismatch(
+            f"Columns {list(columns)} do not match the header on disk {header}"
+        )
+
+
+def locked_append(path, encode, fsync=True):
+    """
+    Appends encode(header) to `path` under an exclusive lock. `header`
+    is the column list already on disk (None for a new file), so the
+    caller decides on the header and column order inside the lock; the
+    bytes go out in one O_APPEND write.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+        _repair_tail(fd)
+        data = encode(_read_header(fd))
+
+        written = 0
+        while written < len(data):
+            written += os.write(fd, data[written:])
+
+        if fsync:
+            os.fsync(fd)
+    finally:
+        # closing the descriptor releases the lock
+        os.close(fd)
+
+
+def append_rows(path, columns, rows, fsync=True):
+    """
+    Appends dict rows with the csv module, in the column order of the
+    header on disk. Raises HeaderMismatch if `columns` differ from it.
+    """
+    if not rows:
+        return
+
+    def encode(header):
+        check_header(header, columns)
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=header or columns, lineterminator="\n")
+        if header is None:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
+
+    locked_append(path, encode, fsync)
+
+
+def repair_csv(path, terminate=False):
+    """
+    Startup recovery: drops a torn last line. terminate keeps a
+    complete last row that only lacks its newline (hand-edited files).
+    Returns bytes removed.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    fd = os.open(path, os.O_RDWR)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return _repair_tail(fd, terminate)
+    finally:
+        os.close(fd)
@@ -18,5 +18,60 @@ from engine.recovery import (
 
 from engine.analysis import (
     imbalance_flags,
-    coverage_completeness_score
+    coverage_completeness_score,
+    analysis_report
+)
+
+from engine.summary import (
+    summarize_sessions,
+    aggregate_summary_by_sessions,
+    aggregate_summary_routine_by_sessions,
+    summary_window,
+    check_summary
+)
+
+from engine.batch import (
+    athlete_metrics,
+    batch_athlete_metrics
+)
+
+from engine.model import (
+    MODEL,
+    ExerciseModel,
+    compile_model,
+    encode_log,
+    load_model
+)
+
+from engine.library import (
+    library_problems,
+    validate_library
+)
+
+from engine.sessions import (
+    SessionIndex
+)
+
+from engine.streaming import (
+    StreamingAnalytics
+)
+
+from engine.workload import (
+    daily_muscle_load,
+    workload_series,
+    acwr_status
+)
+
+from engine.planner import (
+    score_plans,
+    search_plans
+)
+
+from engine.rolling import (
+    RollingTotals,
+    rolling_session_totals
+)
+
+from engine.compact import (
+    CompactLog
 )
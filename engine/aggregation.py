@@ -1,17 +1,27 @@
 import pandas as pd
-from collections import defaultdict
-from .config import DEFAULT_LOAD, SESSION_WINDOWS, EXERCISE_INTENT
-from .core import compute_muscle_contribution, collapse_to_tier1
-
-
+from .config import SESSION_WINDOWS
+from .core import (
+    compute_muscle_contribution,
+    collapse_to_tier1,
+    exercise_codes,
+    exercise_volume
+)
+from .model import MODEL
+from .sessions import session_index
+from .compact import accepts_compact
+from .profiling import profiled
+
+
+@profiled
 def last_n_sessions(log_df, n):
-    log_df = log_df.copy()
-    log_df["date"] = pd.to_datetime(log_df["date"])
-
-    dates = sorted(log_df["date"].unique())[-n:]
-    return log_df[log_df["date"].isin(dates)]
+    """
+    Rows of the last n sessions. Accepts a log DataFrame or a prebuilt
+    SessionIndex (reuse one across calls to skip the sort).
+    """
+    return session_index(log_df).last_n(n)
 
 
+@profiled
 def aggregate_by_sessions(log_df, window_name="weekly"):
     n = SESSION_WINDOWS[window_name]
     window_df = last_n_sessions(log_df, n)
@@ -20,35 +30,40 @@ def aggregate_by_sessions(log_df, window_name="weekly"):
     return collapse_to_tier1(fine)
 
 
+@profiled
+@accepts_compact
 def routine_intensity_contribution(log_df):
-    scores = defaultdict(float)
+    if log_df.empty:
+        return pd.DataFrame(columns=["Routine", "Intensity Score"])
+
+    codes = exercise_codes(log_df, strict=False)
+    volume = pd.Series(exercise_volume(log_df, codes), index=log_df.index)
 
-    for _, row in log_df.iterrows():
-        scores[row["routine"]] += (
-            row["sets"] * row["reps"] * DEFAULT_LOAD.get(row["exercise"], 1.0)
-        )
+    scores = volume.groupby(log_df["routine"], sort=False, observed=True).sum()
 
-    return pd.DataFrame(
-        scores.items(),
-        columns=["Routine", "Intensity Score"]
-    )
+    return pd.DataFrame({
+        "Routine": list(scores.index),
+        "Intensity Score": scores.to_numpy(dtype=float)
+    })
 
 
+@profiled
 def aggregate_routine_by_sessions(log_df, window_name="weekly"):
     n = SESSION_WINDOWS[window_name]
     return routine_intensity_contribution(last_n_sessions(log_df, n))
 
 
+@profiled
+@accepts_compact
 def exercise_wise_push_pull(log_df):
-    push = pull = 0.0
+    if log_df.empty:
+        return 0.0, 0.0
 
-    for _, row in log_df.iterrows():
-        load = row["sets"] * row["reps"] * DEFAULT_LOAD.get(row["exercise"], 1.0)
-        intent = EXERCISE_INTENT.get(row["exercise"], "neutral")
+    codes = exercise_codes(log_df, strict=False)
+    volume = exercise_volume(log_df, codes)
+    intent = MODEL.intent_of(codes)
 
-        if intent == "push":
-            push += load
-        elif intent == "pull":
-            pull += load
+    push = volume[intent == MODEL.intents.index("push")].sum()
+    pull = volume[intent == MODEL.intents.index("pull")].sum()
 
-    return push, pull
+    return float(push), float(pull)
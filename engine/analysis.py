@@ -1,28 +1,42 @@
-from engine.config import MUSCLE_COLLAPSE_MAP
+import numpy as np
+import pandas as pd
+from engine.core import TIER1_MEMBERS
+from engine.profiling import profiled
 
+# flat views of the inverted index: every mapped fine muscle with the
+# code of its Tier-1 group
+REPORT_GROUPS = list(TIER1_MEMBERS)
+REPORT_MUSCLES = [m for g in REPORT_GROUPS for m in TIER1_MEMBERS[g]]
+REPORT_GROUP_CODES = np.repeat(
+    np.arange(len(REPORT_GROUPS)),
+    [len(TIER1_MEMBERS[g]) for g in REPORT_GROUPS]
+)
 
-def imbalance_flags(tier1_df, threshold=1.8):
-    avg = tier1_df["Normalized"].mean()
 
-    tier1_df["Status"] = tier1_df["Normalized"].apply(
-        lambda x: "Overused" if x > threshold * avg
-        else "Undertrained" if x < 0.6 * avg
-        else "Balanced"
+def _imbalance_status(values, threshold):
+    avg = values.mean()
+
+    return np.select(
+        [values > threshold * avg, values < 0.6 * avg],
+        ["Overused", "Undertrained"],
+        default="Balanced"
     )
 
+
+@profiled
+def imbalance_flags(tier1_df, threshold=1.8):
+    tier1_df["Status"] = _imbalance_status(tier1_df["Normalized"].to_numpy(), threshold)
     return tier1_df
 
 
+@profiled
 def coverage_completeness_score(fine_scores, target_group):
     """
     Percentage of fine muscles within a Tier-1 group
     that received non-zero stimulus.
     """
 
-    fine_muscles = [
-        m for m, g in MUSCLE_COLLAPSE_MAP.items()
-        if g == target_group
-    ]
+    fine_muscles = TIER1_MEMBERS.get(target_group, [])
 
     if not fine_muscles:
         return 0.0
@@ -33,3 +47,54 @@ def coverage_completeness_score(fine_scores, target_group):
     )
 
     return trained / len(fine_muscles) * 100
+
+
+@profiled
+def analysis_report(fine_scores, threshold=1.8):
+    """
+    Coverage, completeness and imbalance for every Tier-1 group in one
+    pass over the group -> fine-muscle index.
+
+    coverage     : {group: Fine Muscle | Intensity Score}, as
+                   muscle_coverage_report
+    completeness : group -> % of its fine muscles trained, as
+                   coverage_completeness_score
+    imbalance    : Muscle Group | Intensity Score | Status for the
+                   trained groups, as imbalance_flags (the status is
+                   scale-free, so raw or normalized scores agree)
+    """
+    n_groups = len(REPORT_GROUPS)
+
+    scores = np.array([fine_scores.get(m, 0.0) for m in REPORT_MUSCLES], dtype=float)
+    present = np.array([m in fine_scores for m in REPORT_MUSCLES])
+
+    totals = np.bincount(REPORT_GROUP_CODES, weights=scores, minlength=n_groups)
+    trained = np.bincount(REPORT_GROUP_CODES, weights=scores > 0, minlength=n_groups)
+    sizes = np.bincount(REPORT_GROUP_CODES, minlength=n_groups)
+    touched = np.bincount(REPORT_GROUP_CODES, weights=present, minlength=n_groups) > 0
+
+    long_df = pd.DataFrame({
+        "group": np.array(REPORT_GROUPS)[REPORT_GROUP_CODES],
+        "Fine Muscle": REPORT_MUSCLES,
+        "Intensity Score": scores,
+    }).sort_values("Intensity Score", ascending=False, kind="stable")
+
+    coverage = {
+        group: rows.drop(columns="group")
+        for group, rows in long_df.groupby("group", sort=False)
+    }
+
+    imbalance_df = pd.DataFrame({
+        "Muscle Group": np.array(REPORT_GROUPS)[touched],
+        "Intensity Score": totals[touched],
+    }).sort_values("Intensity Score", ascending=False, kind="stable")
+
+    imbalance_df["Status"] = _imbalance_status(
+        imbalance_df["Intensity Score"].to_numpy(), threshold
+    )
+
+    return {
+        "coverage": coverage,
+        "completeness": pd.Series(trained / sizes * 100, index=REPORT_GROUPS),
+        "imbalance": imbalance_df,
+    }
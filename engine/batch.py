@@ -0,0 +1,117 @@
+# engine/batch.py
+"""
+Per-athlete dashboard metrics, fanned out over a process pool.
+
+Each athlete is scored independently, so the batch parallelizes
+across cores. Workers can receive the log frames directly, or only the
+athlete ids plus a picklable `loader(athlete)` so each process reads
+its own partition and nothing large is sent through the pool.
+"""
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from .config import SESSION_WINDOWS
+from .core import compute_muscle_contribution, collapse_to_tier1
+from .aggregation import (
+    aggregate_by_sessions,
+    aggregate_routine_by_sessions,
+    exercise_wise_push_pull
+)
+from .recovery import unified_muscle_readiness
+from .sessions import SessionIndex
+from .compact import accepts_compact
+from .profiling import profiled
+from .analysis import coverage_completeness_score
+from .progress import (
+    BASELINE_ROUTINE,
+    compute_current_from_logs,
+    routine_progress_series
+)
+
+
+def _scores(df, key):
+    return dict(zip(df[key], df["Intensity Score"]))
+
+
+@profiled
+@accepts_compact
+def athlete_metrics(log_df):
+    """
+    The dashboard's metric set for one athlete's log,
+    as plain dicts / DataFrames.
+    """
+    if log_df.empty:
+        return {"rows": 0, "sessions": 0}
+
+    fine = compute_muscle_contribution(log_df)
+    tier1_df = collapse_to_tier1(fine)
+    push, pull = exercise_wise_push_pull(log_df)
+
+    # one sort shared by every windowed metric
+    sessions = SessionIndex(log_df)
+    current_muscle, current_routine = compute_current_from_logs(sessions)
+
+    return {
+        "rows": len(log_df),
+        "sessions": log_df["date"].nunique(),
+        "fine_scores": dict(fine),
+        "tier1_scores": _scores(tier1_df, "Muscle Group"),
+        "coverage": {
+            group: coverage_completeness_score(fine, group)
+            for group in tier1_df["Muscle Group"]
+        },
+        "push_pull": (push, pull),
+        "readiness": unified_muscle_readiness(log_df),
+        "windows": {
+            name: {
+                "muscle": _scores(aggregate_by_sessions(sessions, name), "Muscle Group"),
+                "routine": _scores(aggregate_routine_by_sessions(sessions, name), "Routine"),
+            }
+            for name in SESSION_WINDOWS
+        },
+        "current": {"muscle": current_muscle, "routine": current_routine},
+        "progress_series": routine_progress_series(log_df, BASELINE_ROUTINE),
+    }
+
+
+def _score_one(task):
+    athlete, log_df, loader = task
+
+    if loader is not None:
+        log_df = loader(athlete)
+
+    return athlete, athlete_metrics(log_df)
+
+
+def batch_athlete_metrics(logs, loader=None, max_workers=None, chunksize=None):
+    """
+    Scores every athlete in a ProcessPoolExecutor.
+
+    logs   : {athlete: log_df}, a DataFrame with an athlete column,
+             or (with `loader`) an iterable of athlete ids
+    loader : picklable callable athlete → log_df, run inside workers
+
+    Returns {athlete: metrics}.
+    """
+    if isinstance(logs, pd.DataFrame):
+        logs = dict(iter(logs.groupby("athlete", sort=False)))
+
+    if loader is None:
+        tasks = [(a, df, None) for a, df in logs.items()]
+    else:
+        tasks = [(a, None, loader) for a in logs]
+
+    if not tasks:
+        return {}
+
+    workers = max_workers or os.cpu_count() or 1
+
+    # several athletes per task amortize pickling / IPC overhead
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+
+    if workers == 1:
+        return dict(map(_score_one, tasks))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_score_one, tasks, chunksize=chunksize))
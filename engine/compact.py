@@ -0,0 +1,162 @@
+# engine/compact.py
+"""
+Array-backed in-memory log.
+
+CompactLog stores a log as typed NumPy arrays: int16 exercise and
+routine codes (engine.model / ROUTINES order, unknown names kept as
+extra trailing categories), int16 sets and reps and int32 epoch days:
+12 bytes per row (14 with several athletes), against ~130 for a frame
+with object strings or ~56 with pandas' Arrow-backed strings.
+Engine functions accept it wherever they take a log; it is expanded to
+a DataFrame (categoricals built from the codes, no string copies) once
+per call, so convert with to_frame() when calling many functions on
+the same log.
+"""
+import functools
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from .config import ROUTINES
+from .model import MODEL
+
+LOG_COLUMNS = ("athlete", "date", "routine", "exercise", "sets", "reps")
+
+_INT16 = np.iinfo(np.int16)
+
+
+def _encode(values, known):
+    """
+    int16 codes over `known` plus any extra values (sorted, appended).
+    """
+    values = pd.Categorical(values)
+    extra = sorted(set(values.categories) - set(known))
+    categories = tuple(known) + tuple(extra)
+
+    if len(categories) > _INT16.max:
+        raise ValueError("Too many distinct values for int16 codes")
+
+    return values.set_categories(list(categories)).codes.astype(np.int16), categories
+
+
+def _small_ints(values, name):
+    values = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # NaN would cast to an arbitrary int16
+    if np.isnan(values).any():
+        raise ValueError(f"{name} has missing values")
+    if len(values) and (values.min() < _INT16.min or values.max() > _INT16.max):
+        raise ValueError(f"{name} out of int16 range")
+
+    return values.astype(np.int16)
+
+
+@dataclass(frozen=True)
+class CompactLog:
+    days: np.ndarray           # int32 days since 1970-01-01
+    exercise: np.ndarray       # int16 codes into exercises
+    routine: np.ndarray        # int16 codes into routines
+    sets: np.ndarray           # int16
+    reps: np.ndarray           # int16
+    exercises: tuple
+    routines: tuple
+    # int16 codes into athletes; None with a single (or no) athlete,
+    # which is then stored once in athletes
+    athlete: np.ndarray = None
+    athletes: tuple = ()
+
+    @classmethod
+    def from_frame(cls, log_df):
+        """
+        Raises ValueError on missing dates and on missing or
+        out-of-int16 sets / reps.
+        """
+        if log_df.empty:
+            empty = np.zeros(0, dtype=np.int16)
+            return cls(np.zeros(0, dtype=np.int32), empty, empty, empty, empty,
+                       MODEL.exercises, tuple(ROUTINES))
+
+        dates = log_df["date"]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+        if dates.isna().any():
+            raise ValueError("CompactLog needs a date on every row")
+
+        days = dates.to_numpy().astype("datetime64[D]").astype(np.int32)
+        exercise, exercises = _encode(log_df["exercise"], MODEL.exercises)
+        routine, routines = _encode(log_df["routine"], tuple(ROUTINES))
+
+        athlete, athletes = None, ()
+        if "athlete" in log_df.columns:
+            athlete, athletes = _encode(log_df["athlete"], ())
+            if len(athletes) == 1:
+                athlete = None
+
+        return cls(
+            days=days,
+            exercise=exercise,
+            routine=routine,
+            sets=_small_ints(log_df["sets"], "sets"),
+            reps=_small_ints(log_df["reps"], "reps"),
+            exercises=exercises,
+            routines=routines,
+            athlete=athlete,
+            athletes=athletes,
+        )
+
+    def to_frame(self):
+        """
+        DataFrame in load_history's layout: categorical exercise and
+        routine coded like engine.model, datetime64 dates.
+        """
+        columns = {}
+
+        if self.athlete is not None:
+            columns["athlete"] = pd.Categorical.from_codes(self.athlete, self.athletes)
+        elif self.athletes:
+            columns["athlete"] = pd.Categorical.from_codes(
+                np.zeros(len(self.days), dtype=np.int8), self.athletes
+            )
+
+        columns["date"] = self.days.astype("datetime64[D]").astype("datetime64[ns]")
+        columns["routine"] = pd.Categorical.from_codes(self.routine, self.routines)
+        columns["exercise"] = pd.Categorical.from_codes(self.exercise, self.exercises)
+        columns["sets"] = self.sets
+        columns["reps"] = self.reps
+
+        return pd.DataFrame(columns)
+
+    @property
+    def columns(self):
+        return LOG_COLUMNS if self.athletes else LOG_COLUMNS[1:]
+
+    @property
+    def empty(self):
+        return len(self.days) == 0
+
+    @property
+    def nbytes(self):
+        arrays = [self.days, self.exercise, self.routine, self.sets, self.reps]
+        if self.athlete is not None:
+            arrays.append(self.athlete)
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self):
+        return len(self.days)
+
+
+def as_frame(log):
+    return log.to_frame() if isinstance(log, CompactLog) else log
+
+
+def accepts_compact(func):
+    """
+    Lets a log-taking engine function receive a CompactLog anywhere a
+    DataFrame log is expected.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        args = [as_frame(a) for a in args]
+        kwargs = {k: as_frame(v) for k, v in kwargs.items()}
+        return func(*args, **kwargs)
+
+    return wrapper
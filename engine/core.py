@@ -1,21 +1,77 @@
 from collections import defaultdict
+import numpy as np
 import pandas as pd
-from .config import EXERCISE_LIBRARY, DEFAULT_LOAD, MUSCLE_COLLAPSE_MAP
+from .model import MODEL
+from .compact import accepts_compact
+from .profiling import profiled
 
 
+def _invert(collapse_map):
+    members = {}
+    for muscle, group in collapse_map.items():
+        members.setdefault(group, []).append(muscle)
+    return members
+
+
+# fine muscle -> Tier-1 group, from the compiled model (no library parse)
+MUSCLE_COLLAPSE_MAP = MODEL.collapse_map
+
+# Tier-1 group -> fine muscles (MUSCLE_COLLAPSE_MAP order), built once
+TIER1_MEMBERS = _invert(MUSCLE_COLLAPSE_MAP)
+
+
+def exercise_codes(log_df, strict=True):
+    """
+    Integer code of each row's exercise in MODEL.exercises.
+    Raises KeyError on exercises missing from EXERCISE_LIBRARY
+    (strict=False maps them to -1 instead).
+    """
+    return MODEL.codes(log_df["exercise"], strict=strict)
+
+
+def log_dates(log_df):
+    """
+    The date column as datetime64; parsed only if it is not already
+    (load_history returns it typed).
+    """
+    dates = log_df["date"]
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates)
+
+
+def exercise_volume(log_df, codes):
+    """
+    sets * reps * load for every row.
+    """
+    return MODEL.volume(log_df, codes)
+
+
+@profiled
+@accepts_compact
 def compute_muscle_contribution(log_df):
     scores = defaultdict(float)
 
-    for _, row in log_df.iterrows():
-        exercise = row["exercise"]
-        base = row["sets"] * row["reps"] * DEFAULT_LOAD.get(exercise, 1.0)
+    if log_df.empty:
+        return scores
+
+    codes = exercise_codes(log_df)
+    volume = exercise_volume(log_df, codes)
+
+    n = len(MODEL.exercises)
+    per_exercise = np.bincount(codes, weights=volume, minlength=n)
+    present = np.bincount(codes, minlength=n) > 0
+
+    muscle_scores = per_exercise @ MODEL.weights
+    touched = (present @ (MODEL.weights > 0)) > 0
 
-        for muscle, weight in EXERCISE_LIBRARY[exercise]["muscles"].items():
-            scores[muscle] += base * weight
+    for j in np.flatnonzero(touched):
+        scores[MODEL.muscles[j]] = float(muscle_scores[j])
 
     return scores
 
 
+@profiled
 def collapse_to_tier1(fine_scores):
     tier1 = defaultdict(float)
 
@@ -28,11 +84,11 @@ def collapse_to_tier1(fine_scores):
     ).sort_values("Intensity Score", ascending=False)
 
 
+@profiled
 def muscle_coverage_report(fine_scores, target_group):
     covered = {
         m: fine_scores.get(m, 0.0)
-        for m, g in MUSCLE_COLLAPSE_MAP.items()
-        if g == target_group
+        for m in TIER1_MEMBERS.get(target_group, [])
     }
 
     return pd.DataFrame(
@@ -0,0 +1,65 @@
+# engine/library.py
+"""
+Consistency checks for the exercise library.
+
+Run once per library file (engine.model caches the compiled result by
+file hash), so a library of thousands of exercises is only walked when
+it changes.
+"""
+import math
+
+WEIGHT_TOLERANCE = 1e-6
+
+
+def library_problems(library, loads, intent, collapse_map, intents):
+    """
+    Every cross-table inconsistency, as readable strings:
+    muscle splits must be positive and sum to 1, every muscle must
+    collapse to a Tier-1 group, loads must be positive, intents known,
+    and loads / intents must not name exercises outside the library.
+    """
+    problems = []
+
+    for ex, spec in library.items():
+        muscles = spec.get("muscles") or {}
+
+        if not muscles:
+            problems.append(f"{ex}: no muscles")
+            continue
+
+        for muscle, weight in muscles.items():
+            if not isinstance(weight, (int, float)) or not weight > 0:
+                problems.append(f"{ex}: weight for {muscle} must be > 0, got {weight!r}")
+            if muscle not in collapse_map:
+                problems.append(f"{ex}: muscle {muscle!r} missing from the Tier-1 collapse")
+
+        total = sum(w for w in muscles.values() if isinstance(w, (int, float)))
+        if not math.isclose(total, 1.0, abs_tol=WEIGHT_TOLERANCE):
+            problems.append(f"{ex}: muscle weights sum to {total:g}, expected 1")
+
+    for ex, load in loads.items():
+        if ex not in library:
+            problems.append(f"load for unknown exercise {ex!r}")
+        elif not isinstance(load, (int, float)) or not load > 0:
+            problems.append(f"{ex}: load must be > 0, got {load!r}")
+
+    for ex, value in intent.items():
+        if ex not in library:
+            problems.append(f"intent for unknown exercise {ex!r}")
+        elif value not in intents:
+            problems.append(f"{ex}: intent {value!r} not one of {', '.join(intents)}")
+
+    for muscle, group in collapse_map.items():
+        if not isinstance(group, str) or not group:
+            problems.append(f"{muscle}: invalid Tier-1 group {group!r}")
+
+    return problems
+
+
+def validate_library(library, loads, intent, collapse_map, intents, source="library"):
+    problems = library_problems(library, loads, intent, collapse_map, intents)
+
+    if problems:
+        raise ValueError(
+            f"Invalid exercise {source}:\n" + "\n".join(f"  - {p}" for p in problems)
+        )
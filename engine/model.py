@@ -0,0 +1,274 @@
+# engine/model.py
+"""
+Compiled, integer-indexed exercise model.
+
+EXERCISE_LIBRARY, DEFAULT_LOAD, MUSCLE_COLLAPSE_MAP and EXERCISE_INTENT
+are compiled once into an immutable ExerciseModel: exercises, fine
+muscles, Tier-1 groups and intents get integer codes, and weights /
+loads live in read-only NumPy arrays. Hot paths index these arrays by
+exercise code instead of looking names up in nested dicts.
+
+MODEL is loaded with load_model(): the library file is validated and
+compiled once, then the arrays are cached in config.CACHE_DIR keyed by
+the file's sha256, so later starts skip validation, compilation and
+even parsing the library JSON.
+"""
+import os
+import hashlib
+import tempfile
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+from . import config
+from .config import CACHE_DIR, LIBRARY_PATH, read_library
+from .library import validate_library
+
+INTENTS = ("push", "pull", "neutral")
+
+
+@dataclass(frozen=True)
+class ExerciseModel:
+    exercises: tuple
+    muscles: tuple
+    tier1_groups: tuple
+    intents: tuple
+
+    exercise_index: MappingProxyType
+    muscle_index: MappingProxyType
+    tier1_index: MappingProxyType
+    # fine muscle -> Tier-1 group, library order (includes muscles no
+    # exercise loads yet)
+    collapse_map: MappingProxyType
+
+    # exercise x muscle split, per-exercise relative load
+    weights: np.ndarray
+    loads: np.ndarray
+    # muscle x tier-1 group (1.0 where collapsed into the group)
+    collapse: np.ndarray
+    # exercise x tier-1 group: exercise loads any muscle of the group
+    membership: np.ndarray
+    # intent code per exercise
+    intent_codes: np.ndarray
+
+    # sha256 of the library file it was loaded from ("" if compiled
+    # from in-memory tables)
+    library_sha256: str = ""
+
+    def codes(self, exercises, strict=True):
+        """
+        Exercise codes for a column of names (or an already encoded
+        categorical). Unknown exercises raise KeyError, or with
+        strict=False get code -1.
+        """
+        values = getattr(exercises, "array", exercises)
+
+        if (
+            isinstance(values, pd.Categorical)
+            and tuple(values.categories[:len(self.exercises)]) == self.exercises
+        ):
+            codes = values.codes.astype(np.intp)
+            codes[codes >= len(self.exercises)] = -1
+        else:
+            codes = pd.Categorical(values, categories=self.exercises).codes.astype(np.intp)
+
+        if strict and (codes < 0).any():
+            raise KeyError(np.asarray(values)[codes < 0][0])
+
+        return codes
+
+    def volume(self, log_df, codes):
+        """
+        sets * reps * load per row; code -1 (unknown) uses load 1.0.
+        """
+        loads = np.append(self.loads, 1.0)
+        sets = log_df["sets"].to_numpy(dtype=float)
+        reps = log_df["reps"].to_numpy(dtype=float)
+        return sets * reps * loads[codes]
+
+    def intent_of(self, codes):
+        """
+        Intent code per row; unknown exercises are neutral.
+        """
+        neutral = INTENTS.index("neutral")
+        return np.append(self.intent_codes, neutral)[codes]
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+def compile_model(library=None, loads=None, collapse_map=None, intent=None):
+    """
+    Compiles library tables (default: engine.config's) into a model.
+    """
+    library = config.EXERCISE_LIBRARY if library is None else library
+    loads = config.DEFAULT_LOAD if loads is None else loads
+    collapse_map = config.MUSCLE_COLLAPSE_MAP if collapse_map is None else collapse_map
+    intent = config.EXERCISE_INTENT if intent is None else intent
+
+    exercises = tuple(library)
+    muscles = tuple(dict.fromkeys(
+        m for spec in library.values() for m in spec["muscles"]
+    ))
+    tier1_groups = tuple(dict.fromkeys(collapse_map.values()))
+
+    exercise_index = {ex: i for i, ex in enumerate(exercises)}
+    muscle_index = {m: j for j, m in enumerate(muscles)}
+    tier1_index = {g: k for k, g in enumerate(tier1_groups)}
+
+    weights = np.zeros((len(exercises), len(muscles)))
+    for ex, spec in library.items():
+        for muscle, weight in spec["muscles"].items():
+            weights[exercise_index[ex], muscle_index[muscle]] = weight
+
+    collapse = np.zeros((len(muscles), len(tier1_groups)))
+    for muscle, j in muscle_index.items():
+        collapse[j, tier1_index[collapse_map[muscle]]] = 1.0
+
+    return model_from_arrays(
+        exercises, muscles, tier1_groups,
+        weights=weights,
+        loads=np.array([loads.get(ex, 1.0) for ex in exercises]),
+        collapse=collapse,
+        intent_codes=np.array([
+            INTENTS.index(intent.get(ex, "neutral")) for ex in exercises
+        ], dtype=np.int8),
+        collapse_muscles=tuple(collapse_map),
+        collapse_groups=tuple(collapse_map.values()),
+    )
+
+
+def model_from_arrays(exercises, muscles, tier1_groups, weights, loads, collapse, intent_codes,
+                      collapse_muscles, collapse_groups):
+    """
+    Builds the lookup tables and derived arrays around the stored ones
+    (shared by compile_model and the binary cache).
+    """
+    # plain str, also when read back from the npz cache
+    exercises, muscles, tier1_groups = (
+        tuple(map(str, names)) for names in (exercises, muscles, tier1_groups)
+    )
+    collapse_map = {str(m): str(g) for m, g in zip(collapse_muscles, collapse_groups)}
+
+    return ExerciseModel(
+        exercises=exercises,
+        muscles=muscles,
+        tier1_groups=tier1_groups,
+        intents=INTENTS,
+        exercise_index=MappingProxyType({ex: i for i, ex in enumerate(exercises)}),
+        muscle_index=MappingProxyType({m: j for j, m in enumerate(muscles)}),
+        tier1_index=MappingProxyType({g: k for k, g in enumerate(tier1_groups)}),
+        collapse_map=MappingProxyType(collapse_map),
+        weights=_readonly(np.asarray(weights, dtype=float)),
+        loads=_readonly(np.asarray(loads, dtype=float)),
+        collapse=_readonly(np.asarray(collapse, dtype=float)),
+        membership=_readonly((np.asarray(weights) @ np.asarray(collapse)) > 0),
+        intent_codes=_readonly(np.asarray(intent_codes, dtype=np.int8)),
+    )
+
+
+# ==============================
+# BINARY MODEL CACHE
+# ==============================
+
+MODEL_CACHE_DIR = CACHE_DIR
+
+# bump when the cached array layout changes
+MODEL_CACHE_VERSION = 2
+
+
+def _cache_file(data, cache_dir):
+    key = hashlib.sha256(data)
+    key.update(repr((MODEL_CACHE_VERSION, INTENTS)).encode())
+    return os.path.join(cache_dir, f"model-{key.hexdigest()[:24]}.npz")
+
+
+def _save_model(model, path):
+    folder = os.path.dirname(path) or "."
+    try:
+        os.makedirs(folder, exist_ok=True)
+        # a private temp file: processes starting cold together each
+        # replace the cache with a complete file of their own
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    except OSError:
+        return  # read-only location: compile again next start
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                exercises=np.array(model.exercises, dtype=str),
+                muscles=np.array(model.muscles, dtype=str),
+                tier1_groups=np.array(model.tier1_groups, dtype=str),
+                weights=model.weights,
+                loads=model.loads,
+                collapse=model.collapse,
+                intent_codes=model.intent_codes,
+                collapse_muscles=np.array(list(model.collapse_map), dtype=str),
+                collapse_groups=np.array(list(model.collapse_map.values()), dtype=str),
+            )
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+
+
+def _load_cached_model(path):
+    try:
+        with np.load(path, allow_pickle=False) as arrays:
+            return model_from_arrays(**{name: arrays[name] for name in arrays.files})
+    except Exception:
+        # truncated / corrupt / outdated cache (BadZipFile, EOFError, ...):
+        # a miss, so load_model recompiles and overwrites it
+        return None
+
+
+def load_model(path=LIBRARY_PATH, cache_dir=MODEL_CACHE_DIR):
+    """
+    The compiled model for a library file. A cached binary keyed by the
+    file's sha256 loads directly; otherwise the library is validated,
+    compiled and cached. Raises ValueError on an inconsistent library.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    digest = hashlib.sha256(data).hexdigest()
+    cache_file = _cache_file(data, cache_dir) if cache_dir else None
+
+    if cache_file and os.path.exists(cache_file):
+        model = _load_cached_model(cache_file)
+        if model is not None:
+            return replace(model, library_sha256=digest)
+
+    library, loads, intent, collapse_map = read_library(path)
+    validate_library(library, loads, intent, collapse_map, INTENTS, source=f"library {path}")
+
+    model = compile_model(library, loads, collapse_map, intent)
+
+    if cache_file:
+        _save_model(model, cache_file)
+
+    return replace(model, library_sha256=digest)
+
+
+MODEL = load_model()
+
+
+def encode_log(log_df, routines=(), model=MODEL):
+    """
+    Turns the exercise and routine columns into categoricals whose
+    codes match the model (exercise) and `routines` order. Values
+    outside those lists are kept as extra trailing categories.
+    """
+    if log_df.empty:
+        return log_df
+
+    log_df = log_df.copy()
+
+    for column, known in [("exercise", model.exercises), ("routine", tuple(routines))]:
+        values = pd.Categorical(log_df[column])
+        extra = sorted(set(values.categories) - set(known))
+        log_df[column] = values.set_categories(list(known) + extra)
+
+    return log_df
@@ -0,0 +1,170 @@
+# engine/planner.py
+"""
+Set / rep planner for a routine.
+
+A candidate plan is a row of sets and a row of reps over the routine's
+allowed exercises (sets = 0 drops the exercise). Batches of plans are
+scored at once: volume (plans x exercises) times the load-scaled
+exercise x Tier-1 matrix gives every plan's Tier-1 profile in one
+matrix multiply. The search alternates random batches with mutations
+of the best plans found so far.
+"""
+import time
+import numpy as np
+import pandas as pd
+from .config import ROUTINES, SECONDS_PER_REP, REST_SECONDS_PER_SET
+from .model import MODEL
+from .profiling import profiled
+
+
+def plan_matrix(exercises):
+    """
+    exercise x Tier-1 intensity per rep (load * weight, collapsed).
+    """
+    codes = MODEL.codes(list(exercises))
+    return (MODEL.loads[codes, None] * MODEL.weights[codes]) @ MODEL.collapse
+
+
+def score_plans(sets, reps, exercises, target_tier1, target_routine=None,
+                time_budget=None, matrix=None):
+    """
+    Scores a batch of plans (sets, reps: plans x exercises).
+
+    score is the sum of squared relative errors against the Tier-1
+    targets (plus the routine intensity target, if given); plans over
+    `time_budget` minutes score inf. Returns a dict of per-plan
+    arrays: score, tier1 (plans x groups), intensity, minutes.
+    """
+    matrix = plan_matrix(exercises) if matrix is None else matrix
+
+    sets = np.asarray(sets, dtype=float)
+    reps = np.asarray(reps, dtype=float)
+
+    tier1 = (sets * reps) @ matrix
+    intensity = (sets * reps) @ MODEL.loads[MODEL.codes(list(exercises))]
+    minutes = (sets * (reps * SECONDS_PER_REP + REST_SECONDS_PER_SET)).sum(axis=1) / 60
+
+    groups = [MODEL.tier1_index[g] for g in target_tier1]
+    targets = np.array(list(target_tier1.values()), dtype=float)
+    scale = np.where(targets > 0, targets, 1.0)
+
+    score = (((tier1[:, groups] - targets) / scale) ** 2).sum(axis=1)
+
+    if target_routine is not None:
+        score += ((intensity - target_routine) / max(target_routine, 1.0)) ** 2
+
+    if time_budget is not None:
+        score[minutes > time_budget] = np.inf
+
+    return {"score": score, "tier1": tier1, "intensity": intensity, "minutes": minutes}
+
+
+def _random_plans(rng, n, n_ex, set_bounds, rep_bounds, include):
+    sets = rng.integers(set_bounds[0], set_bounds[1] + 1, size=(n, n_ex))
+    reps = rng.integers(rep_bounds[0], rep_bounds[1] + 1, size=(n, n_ex))
+    sets[rng.random((n, n_ex)) >= include] = 0
+    return sets, reps
+
+
+def _mutate(rng, sets, reps, set_bounds, rep_bounds):
+    """
+    One +-1 step on a random set and rep count per plan, plus an
+    occasional exercise dropped / added back.
+    """
+    n, n_ex = sets.shape
+    rows = np.arange(n)
+
+    sets, reps = sets.copy(), reps.copy()
+
+    col = rng.integers(0, n_ex, n)
+    step = rng.choice([-1, 1], n)
+    new_sets = sets[rows, col] + step
+    # stepping below the minimum drops the exercise; from 0 it comes back
+    new_sets = np.where(new_sets < set_bounds[0], np.where(step < 0, 0, set_bounds[0]), new_sets)
+    sets[rows, col] = np.minimum(new_sets, set_bounds[1])
+
+    col = rng.integers(0, n_ex, n)
+    reps[rows, col] = np.clip(reps[rows, col] + rng.choice([-1, 1], n), *rep_bounds)
+
+    return sets, reps
+
+
+@profiled
+def search_plans(routine, target_tier1, target_routine=None, exercises=None,
+                 set_bounds=(1, 5), rep_bounds=(5, 15), time_budget=None,
+                 iterations=50, batch_size=20_000, top_k=64, include=0.7, seed=None):
+    """
+    Searches set / rep plans for `routine` (exercises default to
+    ROUTINES[routine]) that best hit `target_tier1` ({group: intensity})
+    and optionally `target_routine` intensity within `time_budget`
+    minutes.
+
+    Returns a dict: plan (exercise | sets | reps), score, tier1
+    ({group: intensity}), intensity, minutes, evaluated, seconds.
+    Unknown exercises raise KeyError.
+    """
+    exercises = list(exercises or ROUTINES[routine])
+
+    unknown = [ex for ex in exercises if ex not in MODEL.exercise_index]
+    if unknown:
+        raise KeyError(f"Unknown exercises: {', '.join(unknown)}")
+
+    matrix = plan_matrix(exercises)
+    rng = np.random.default_rng(seed)
+    n_ex = len(exercises)
+
+    def score(sets, reps):
+        return score_plans(sets, reps, exercises, target_tier1, target_routine,
+                           time_budget, matrix)["score"]
+
+    elite_sets = np.zeros((0, n_ex), dtype=np.int64)
+    elite_reps = np.zeros((0, n_ex), dtype=np.int64)
+    elite_scores = np.zeros(0)
+
+    evaluated = 0
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        n_random = batch_size if len(elite_scores) == 0 else batch_size // 2
+        sets, reps = _random_plans(rng, n_random, n_ex, set_bounds, rep_bounds, include)
+
+        if len(elite_scores):
+            parents = rng.integers(0, len(elite_scores), batch_size - n_random)
+            child_sets, child_reps = _mutate(
+                rng, elite_sets[parents], elite_reps[parents], set_bounds, rep_bounds
+            )
+            sets = np.vstack([sets, child_sets])
+            reps = np.vstack([reps, child_reps])
+
+        scores = score(sets, reps)
+        evaluated += len(scores)
+
+        sets = np.vstack([elite_sets, sets])
+        reps = np.vstack([elite_reps, reps])
+        scores = np.concatenate([elite_scores, scores])
+
+        best = np.argsort(scores, kind="stable")[:top_k]
+        elite_sets, elite_reps, elite_scores = sets[best], reps[best], scores[best]
+
+    seconds = time.perf_counter() - start
+
+    best_sets, best_reps = elite_sets[:1], elite_reps[:1]
+    result = score_plans(best_sets, best_reps, exercises, target_tier1,
+                         target_routine, time_budget, matrix)
+
+    chosen = best_sets[0] > 0
+    plan = pd.DataFrame({
+        "exercise": np.array(exercises)[chosen],
+        "sets": best_sets[0][chosen],
+        "reps": best_reps[0][chosen],
+    })
+
+    return {
+        "plan": plan,
+        "score": float(result["score"][0]),
+        "tier1": dict(zip(MODEL.tier1_groups, result["tier1"][0].tolist())),
+        "intensity": float(result["intensity"][0]),
+        "minutes": float(result["minutes"][0]),
+        "evaluated": evaluated,
+        "seconds": seconds,
+    }
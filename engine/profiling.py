@@ -0,0 +1,222 @@
+# engine/profiling.py
+"""
+Opt-in hot-path instrumentation.
+
+Public engine functions and logger.load_history / save_session are
+wrapped with @profiled. While profiling is off (the default) a wrapped
+call costs one global flag check. When on, every call records wall
+time, input row count and, if memory tracking is on, the peak
+allocation observed through tracemalloc.
+
+Enable with WORKOUT_PROFILE=1 (WORKOUT_PROFILE=memory also tracks
+allocations) or profiling.enable(). Export with to_json() or
+to_chrome_trace() (load in chrome://tracing or Perfetto).
+"""
+import os
+import json
+import time
+import functools
+import threading
+import tracemalloc
+from collections import defaultdict
+
+_enabled = False
+_track_memory = False
+
+_events = []
+_sections = []
+_section_start = None
+_memory_stack = []
+_lock = threading.Lock()
+_epoch = time.perf_counter()
+
+
+def enable(track_memory=False):
+    global _enabled, _track_memory
+    _enabled = True
+    _track_memory = track_memory
+
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    global _enabled, _track_memory
+    _enabled = False
+
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _track_memory = False
+
+
+def enabled():
+    return _enabled
+
+
+def reset():
+    """
+    Clears recorded calls and sections (e.g. at the start of a rerun).
+    """
+    global _section_start
+    with _lock:
+        _events.clear()
+        _sections.clear()
+    _section_start = None
+
+
+def _rows(args, result):
+    """
+    Row count of the log argument, else of a returned frame
+    (e.g. load_history).
+    """
+    log = args[0] if args else None
+    log = getattr(log, "log", log)  # SessionIndex
+
+    if not hasattr(log, "columns"):
+        log = result
+
+    if hasattr(log, "columns") and hasattr(log, "__len__"):
+        return len(log)
+    return None
+
+
+def profiled(func):
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        memory = _track_memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # fold the peak so far into the enclosing call before resetting
+            if _memory_stack:
+                _memory_stack[-1][1] = max(_memory_stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            _memory_stack.append([current, current])
+
+        result = None
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            end = time.perf_counter()
+            peak = None
+
+            if memory:
+                before, running = _memory_stack.pop()
+                running = max(running, tracemalloc.get_traced_memory()[1])
+                peak = running - before
+
+                if _memory_stack:
+                    _memory_stack[-1][1] = max(_memory_stack[-1][1], running)
+
+            with _lock:
+                _events.append({
+                    "name": name,
+                    "start": start - _epoch,
+                    "seconds": end - start,
+                    "rows": _rows(args, result),
+                    "peak_bytes": peak,
+                    "thread": threading.get_ident(),
+                })
+
+    return wrapper
+
+
+def checkpoint(name):
+    """
+    Starts a named section; the previous section ends here.
+    """
+    global _section_start
+    if not _enabled:
+        return
+
+    now = time.perf_counter() - _epoch
+    close_section(now)
+    _section_start = (name, now)
+
+
+def close_section(now=None):
+    global _section_start
+    if _section_start is None:
+        return
+
+    now = time.perf_counter() - _epoch if now is None else now
+    name, start = _section_start
+
+    with _lock:
+        _sections.append({"name": name, "start": start, "seconds": now - start})
+    _section_start = None
+
+
+def section_timings():
+    with _lock:
+        return [dict(s) for s in _sections]
+
+
+def function_stats():
+    """
+    Per-function totals: calls, wall seconds, rows, max peak bytes.
+    """
+    stats = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "rows": 0, "peak_bytes": None})
+
+    with _lock:
+        events = list(_events)
+
+    for event in events:
+        entry = stats[event["name"]]
+        entry["calls"] += 1
+        entry["seconds"] += event["seconds"]
+        entry["rows"] += event["rows"] or 0
+
+        if event["peak_bytes"] is not None:
+            entry["peak_bytes"] = max(entry["peak_bytes"] or 0, event["peak_bytes"])
+
+    return dict(sorted(stats.items(), key=lambda kv: -kv[1]["seconds"]))
+
+
+def to_json(indent=2):
+    with _lock:
+        events = list(_events)
+
+    return json.dumps({
+        "sections": section_timings(),
+        "functions": function_stats(),
+        "calls": events,
+    }, indent=indent)
+
+
+def to_chrome_trace():
+    """
+    Chrome trace-event JSON: sections on their own track, calls on
+    the thread that made them.
+    """
+    pid = os.getpid()
+    trace = []
+
+    for s in section_timings():
+        trace.append({
+            "name": s["name"], "cat": "section", "ph": "X", "pid": pid, "tid": 0,
+            "ts": s["start"] * 1e6, "dur": s["seconds"] * 1e6,
+        })
+
+    with _lock:
+        events = list(_events)
+
+    for e in events:
+        trace.append({
+            "name": e["name"], "cat": "call", "ph": "X", "pid": pid, "tid": e["thread"],
+            "ts": e["start"] * 1e6, "dur": e["seconds"] * 1e6,
+            "args": {"rows": e["rows"], "peak_bytes": e["peak_bytes"]},
+        })
+
+    return json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"})
+
+
+_mode = os.environ.get("WORKOUT_PROFILE", "").strip().lower()
+if _mode in ("1", "true", "yes", "on", "memory"):
+    enable(track_memory=_mode == "memory")
@@ -1,13 +1,20 @@
 # engine/progress.py
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
 import pandas as pd
 from collections import defaultdict
-from engine.config import DEFAULT_LOAD
-from engine.core import compute_muscle_contribution
+from engine.config import CACHE_DIR
+from engine.core import exercise_codes, exercise_volume, log_dates
+from engine.model import MODEL
+from engine.sessions import session_index
+from engine.compact import accepts_compact
+from engine.profiling import profiled
 from engine.aggregation import (
     aggregate_by_sessions,
-    aggregate_routine_by_sessions, 
-    last_n_sessions, 
-    routine_intensity_contribution
+    aggregate_routine_by_sessions
 )
 
 
@@ -62,44 +69,109 @@ FINAL_ROUTINES = {
     ],
 }
 
-def compute_final_target():
+# derived targets, reused while the fingerprint of their inputs holds
+FINAL_TARGET_CACHE = os.path.join(CACHE_DIR, "final_target.json")
+
+_final_target = {}
+
+
+def final_target_fingerprint(model=MODEL):
     """
-    Simulates final target routines as log entries
-    and reuses existing aggregation logic.
+    sha256 over every input of the final targets: FINAL_ROUTINES and
+    the hash of the library file the model was loaded from (computed
+    once by load_model), so no per-call walk over the library.
     """
+    inputs = [FINAL_ROUTINES, model.library_sha256]
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
 
-    rows = []
 
-    for routine, exercises in FINAL_ROUTINES.items():
-        for ex, sets, reps in exercises:
-            rows.append({
-                "date": "2099-01-01",  # dummy date (single session)
-                "routine": routine,
-                "exercise": ex,
-                "sets": sets,
-                "reps": reps,
-            })
+def _derive_final_target(model=MODEL):
+    """
+    FINAL_ROUTINES as one simulated session, scored against the model
+    (same numbers as running it through aggregate_by_sessions /
+    aggregate_routine_by_sessions).
+    """
 
-    final_df = pd.DataFrame(rows)
+    per_exercise = np.zeros(len(model.exercises))
+    present = np.zeros(len(model.exercises), dtype=bool)
+    routine_scores = {}
 
-    # Reuse canonical aggregation
-    muscle_df = aggregate_by_sessions(final_df, window_name="weekly")
-    routine_df = aggregate_routine_by_sessions(final_df, window_name="weekly")
+    for routine, exercises in FINAL_ROUTINES.items():
+        codes = model.codes([ex for ex, _, _ in exercises])
+        volume = np.array([sets * reps for _, sets, reps in exercises]) * model.loads[codes]
 
-    muscle_scores = dict(
-        zip(muscle_df["Muscle Group"], muscle_df["Intensity Score"])
-    )
+        np.add.at(per_exercise, codes, volume)
+        present[codes] = True
+        routine_scores[routine] = float(volume.sum())
 
-    routine_scores = dict(
-        zip(routine_df["Routine"], routine_df["Intensity Score"])
-    )
+    tier1 = per_exercise @ model.weights @ model.collapse
+    touched = (present @ (model.weights > 0)) @ model.collapse > 0
+
+    order = sorted(np.flatnonzero(touched), key=lambda k: -tier1[k])
+    muscle_scores = {model.tier1_groups[k]: float(tier1[k]) for k in order}
 
     return muscle_scores, routine_scores
 
+
+def _read_final_target(path, fingerprint):
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return None
+    return cached["muscle"], cached["routine"]
+
+
+def _write_final_target(path, fingerprint, target):
+    folder = os.path.dirname(path) or "."
+    try:
+        os.makedirs(folder, exist_ok=True)
+        # private temp file, so concurrent writers never interleave
+        fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    except OSError:
+        return  # read-only checkout: the memory cache still applies
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"fingerprint": fingerprint, "muscle": target[0], "routine": target[1]}, f)
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+
+
+@profiled
+def compute_final_target(cache_path=FINAL_TARGET_CACHE):
+    """
+    (muscle_scores, routine_scores) of FINAL_ROUTINES. Derived on first
+    use, then served from memory or `cache_path` while the config
+    fingerprint matches. Returns fresh dicts on every call.
+    """
+    fingerprint = final_target_fingerprint()
+    target = _final_target.get(fingerprint)
+
+    if target is None and cache_path is not None:
+        target = _read_final_target(cache_path, fingerprint)
+
+    if target is None:
+        target = _derive_final_target()
+        if cache_path is not None:
+            _write_final_target(cache_path, fingerprint, target)
+
+    _final_target.clear()
+    _final_target[fingerprint] = target
+
+    return dict(target[0]), dict(target[1])
+
+@profiled
 def compute_current_from_logs(log_df):
     """
     Uses last 3 sessions (weekly window)
     """
+    log_df = session_index(log_df)
+
     muscle_df = aggregate_by_sessions(log_df, window_name="weekly")
     routine_df = aggregate_routine_by_sessions(log_df, window_name="weekly")
 
@@ -126,35 +198,44 @@ def progress_ratio(current, baseline, final):
         "progress_to_final": max(0.0, min(progress, 1.0))
     }
 
+@profiled
+@accepts_compact
 def routine_progress_series(log_df, baseline_routine, window=3):
     """
     Returns a DataFrame with:
     date | push | pull | core
     where values = (current - baseline)
+
+    Routine totals are computed once per session; each window sum is
+    a difference of cumulative sums, so the cost is linear in history.
     """
 
-    log_df = log_df.copy()
-    log_df["date"] = pd.to_datetime(log_df["date"])
+    if log_df.empty:
+        return pd.DataFrame()
 
-    dates = sorted(log_df["date"].unique())
+    dates = log_dates(log_df)
+    codes = exercise_codes(log_df, strict=False)
+    volume = pd.Series(exercise_volume(log_df, codes), index=log_df.index)
 
-    rows = []
+    routines = ["push", "pull", "core"]
+
+    per_session = (
+        volume.groupby([dates, log_df["routine"].astype(object)]).sum()
+        .unstack(fill_value=0.0)
+        .reindex(columns=routines, fill_value=0.0)
+    )
 
-    for i in range(window - 1, len(dates)):
-        window_dates = dates[i - window + 1 : i + 1]
-        window_df = log_df[log_df["date"].isin(window_dates)]
+    if len(per_session) < window:
+        return pd.DataFrame()
 
-        routine_df = routine_intensity_contribution(window_df)
+    totals = per_session.to_numpy(dtype=float)
+    cumulative = np.vstack([np.zeros(len(routines)), totals.cumsum(axis=0)])
+    window_sums = cumulative[window:] - cumulative[:-window]
 
-        lookup = dict(
-            zip(routine_df["Routine"], routine_df["Intensity Score"])
-        )
+    result = pd.DataFrame(window_sums, columns=routines)
+    result.insert(0, "date", per_session.index[window - 1:])
 
-        rows.append({
-            "date": dates[i],
-            "push": lookup.get("push", 0.0) - baseline_routine["push"],
-            "pull": lookup.get("pull", 0.0) - baseline_routine["pull"],
-            "core": lookup.get("core", 0.0) - baseline_routine["core"],
-        })
+    for routine in routines:
+        result[routine] -= baseline_routine[routine]
 
-    return pd.DataFrame(rows)
+    return result
@@ -2,7 +2,10 @@ import numpy as np
 import pandas as pd
 import datetime
 from .config import RECOVERY_TAU, AVG_SLEEP_HOURS
-from .core import compute_muscle_contribution, collapse_to_tier1
+from .core import exercise_codes, log_dates
+from .model import MODEL
+from .compact import accepts_compact
+from .profiling import profiled
 
 
 def sleep_modifier(hours):
@@ -21,47 +24,85 @@ def recovery_weight(days_ago, tau):
     return np.exp(-days_ago / tau)
 
 
-def muscle_recovery_percentage_today(log_df, reference_date=None):
+NAT = np.iinfo(np.int64).min
+
+
+@accepts_compact
+def last_dates_by_exercise(log_df):
+    """
+    Latest date (int64 ns, NAT if never) each exercise appears in the log.
+    """
+    last_by_ex = np.full(len(MODEL.exercises), NAT, dtype=np.int64)
+
+    if log_df.empty:
+        return last_by_ex
+
+    codes = exercise_codes(log_df)
+    dates = log_dates(log_df).to_numpy().astype("datetime64[ns]")
+
+    per_exercise = pd.Series(dates.view(np.int64)).groupby(codes).max()
+    last_by_ex[per_exercise.index] = per_exercise.to_numpy()
+
+    return last_by_ex
+
+
+def group_last_dates(last_by_ex, groups):
+    """
+    Reduces per-exercise last dates to the last date of each Tier-1 group.
+    """
+    member = MODEL.membership[:, [MODEL.tier1_index[g] for g in groups]]
+    last = np.where(member, last_by_ex[:, None], NAT).max(axis=0)
+
+    return last.view("datetime64[ns]")
+
+
+@accepts_compact
+def last_stimulus_dates(log_df, groups):
+    """
+    Last date each Tier-1 group was trained, in one pass over the log.
+    Groups never trained come back as NaT.
+    """
+    return group_last_dates(last_dates_by_exercise(log_df), groups)
+
+
+def recovery_from_last_dates(last, groups, reference_date=None):
     if reference_date is None:
         reference_date = pd.to_datetime(datetime.date.today())
 
-    recovery = {}
-    tier1_groups = set(RECOVERY_TAU.keys())
+    reference = np.datetime64(pd.Timestamp(reference_date), "ns")
+    trained = ~np.isnat(last)
 
-    for muscle in tier1_groups:
-        relevant = []
+    days = (reference - np.where(trained, last, reference)) // np.timedelta64(1, "D")
+    tau = np.array([RECOVERY_TAU[g] for g in groups]) * sleep_modifier(AVG_SLEEP_HOURS)
 
-        for _, row in log_df.iterrows():
-            fine = compute_muscle_contribution(pd.DataFrame([row]))
-            tier1 = collapse_to_tier1(fine)
+    recovery = np.where(trained, 1 - np.exp(-days / tau), 1.0)
 
-            if muscle in tier1["Muscle Group"].values:
-                intensity = tier1.loc[
-                    tier1["Muscle Group"] == muscle, "Intensity Score"
-                ].values[0]
-                relevant.append((row["date"], intensity))
-
-        if not relevant:
-            recovery[muscle] = 1.0
-            continue
+    return pd.DataFrame({
+        "Muscle Group": groups,
+        "Recovery": recovery
+    })
 
-        last_date, _ = max(relevant, key=lambda x: x[0])
-        days = (reference_date - last_date).days
-        tau = RECOVERY_TAU[muscle] * sleep_modifier(AVG_SLEEP_HOURS)
 
-        recovery[muscle] = 1 - np.exp(-days / tau)
+@profiled
+@accepts_compact
+def muscle_recovery_percentage_today(log_df, reference_date=None):
+    groups = list(RECOVERY_TAU.keys())
+    last = last_stimulus_dates(log_df, groups)
 
-    return pd.DataFrame(
-        recovery.items(),
-        columns=["Muscle Group", "Recovery"]
-    )
+    return recovery_from_last_dates(last, groups, reference_date)
 
 
-def unified_muscle_readiness(log_df, alpha=1.5):
-    rec = muscle_recovery_percentage_today(log_df).set_index("Muscle Group")["Recovery"]
+def readiness_from_recovery(recovery_df, alpha=1.5):
+    rec = recovery_df.set_index("Muscle Group")["Recovery"]
     readiness = rec * np.exp(-alpha * (rec - 1) ** 2)
 
     return pd.DataFrame({
         "Recovery": rec.round(2),
         "Readiness Score": readiness.round(2)
     }).sort_values("Readiness Score")
+
+
+@profiled
+@accepts_compact
+def unified_muscle_readiness(log_df, alpha=1.5):
+    return readiness_from_recovery(muscle_recovery_percentage_today(log_df), alpha)
@@ -0,0 +1,97 @@
+# engine/rolling.py
+"""
+Rolling per-session totals for several window sizes at once.
+
+Each session is scored once (one bincount over (session, exercise) and
+a matrix multiply); every window is then a difference of the same
+cumulative sum, so adding windows costs O(sessions x muscles) each,
+not another pass over the raw rows.
+"""
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from .config import ROLLING_WINDOWS
+from .core import exercise_codes, exercise_volume
+from .model import MODEL
+from .sessions import session_index
+from .profiling import profiled
+
+
+@dataclass(frozen=True)
+class RollingTotals:
+    """
+    values[s, m, w]: total of muscle m over the windows[w] sessions
+    ending at session s (fewer at the start of the history).
+    """
+    dates: np.ndarray
+    muscles: tuple
+    windows: tuple
+    values: np.ndarray
+
+    def frame(self, window):
+        """
+        date x muscle DataFrame for one window size.
+        """
+        w = self.windows.index(window)
+        return pd.DataFrame(
+            self.values[:, :, w],
+            index=pd.DatetimeIndex(self.dates, name="date"),
+            columns=list(self.muscles)
+        )
+
+    def series(self, muscle):
+        """
+        date x window DataFrame for one muscle (trend chart input).
+        """
+        m = self.muscles.index(muscle)
+        return pd.DataFrame(
+            self.values[:, m, :],
+            index=pd.DatetimeIndex(self.dates, name="date"),
+            columns=list(self.windows)
+        )
+
+
+@profiled
+def rolling_session_totals(log, windows=ROLLING_WINDOWS, level="tier1"):
+    """
+    Per-session rolling totals for every window in `windows`, at the
+    fine-muscle or Tier-1 level. The last row of window n matches
+    aggregate_by_sessions over the last n sessions. Accepts a log
+    DataFrame or a SessionIndex.
+    """
+    windows = tuple(int(w) for w in windows)
+    muscles = MODEL.muscles if level == "fine" else MODEL.tier1_groups
+
+    if level not in ("fine", "tier1"):
+        raise ValueError(f"Unknown level: {level}")
+
+    index = session_index(log)
+    n_sessions = len(index)
+
+    if index.empty:
+        return RollingTotals(
+            index.dates, muscles, windows,
+            np.zeros((0, len(muscles), len(windows)))
+        )
+
+    codes = exercise_codes(index.log)
+    volume = exercise_volume(index.log, codes)
+    session = np.repeat(np.arange(n_sessions), np.diff(index.starts))
+
+    n_ex = len(MODEL.exercises)
+    per_session = np.bincount(
+        session * n_ex + codes, weights=volume, minlength=n_sessions * n_ex
+    ).reshape(n_sessions, n_ex) @ MODEL.weights
+
+    if level == "tier1":
+        per_session = per_session @ MODEL.collapse
+
+    cumulative = np.vstack([np.zeros((1, len(muscles))), per_session.cumsum(axis=0)])
+    ends = np.arange(1, n_sessions + 1)
+
+    values = np.stack([
+        cumulative[ends] - cumulative[np.maximum(ends - w, 0)]
+        for w in windows
+    ], axis=2)
+
+    return RollingTotals(index.dates, muscles, windows, values)
@@ -0,0 +1,83 @@
+# engine/sessions.py
+"""
+Sorted session index over a log.
+
+Built once over a date-sorted view of the log; each session (unique
+date) maps to a contiguous row range, so "last N sessions" and date
+ranges are a searchsorted plus an iloc slice instead of a full
+unique / sort / isin pass per call.
+"""
+import numpy as np
+import pandas as pd
+from .compact import as_frame
+from .core import log_dates
+
+
+class SessionIndex:
+
+    def __init__(self, log_df):
+        log_df = as_frame(log_df)
+
+        if log_df.empty:
+            self.log = log_df
+            self.row_dates = np.array([], dtype="datetime64[ns]")
+            self.dates = self.row_dates
+            self.starts = np.zeros(1, dtype=np.intp)
+            return
+
+        # a typed, sorted log (load_history) is used as is, no copy
+        if not pd.api.types.is_datetime64_any_dtype(log_df["date"]):
+            log_df = log_df.assign(date=log_dates(log_df))
+        if log_df["date"].isna().any():
+            log_df = log_df[log_df["date"].notna()]
+        if not log_df["date"].is_monotonic_increasing:
+            log_df = log_df.sort_values("date", kind="stable")
+
+        row_dates = log_df["date"].to_numpy().astype("datetime64[ns]")
+        breaks = np.flatnonzero(row_dates[1:] != row_dates[:-1]) + 1
+
+        self.log = log_df
+        self.row_dates = row_dates
+        # session i spans rows starts[i]:starts[i + 1]
+        self.starts = np.concatenate([[0], breaks, [len(row_dates)]]).astype(np.intp)
+        self.dates = row_dates[self.starts[:-1]]
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def empty(self):
+        return len(self.row_dates) == 0
+
+    def session(self, i):
+        return self.log.iloc[self.starts[i]:self.starts[i + 1]]
+
+    def last_n(self, n):
+        if n <= 0:
+            return self.log.iloc[:0]
+
+        first = max(len(self.dates) - n, 0)
+        return self.log.iloc[self.starts[first]:]
+
+    def date_range(self, start=None, end=None):
+        """
+        Rows with start <= date <= end (either bound optional).
+        """
+        lo = 0
+        hi = len(self.row_dates)
+
+        if start is not None:
+            lo = np.searchsorted(self.row_dates, np.datetime64(pd.Timestamp(start), "ns"), "left")
+        if end is not None:
+            hi = np.searchsorted(self.row_dates, np.datetime64(pd.Timestamp(end), "ns"), "right")
+
+        return self.log.iloc[lo:max(lo, hi)]
+
+
+def session_index(log):
+    """
+    Accepts a log DataFrame, a CompactLog or an existing SessionIndex.
+    """
+    if isinstance(log, SessionIndex):
+        return log
+    return SessionIndex(log)
@@ -0,0 +1,162 @@
+# engine/streaming.py
+"""
+Online aggregators for bounded-memory analysis of very large logs.
+
+Each aggregator consumes typed log batches (see logger.iter_history)
+with update(batch) and keeps only O(exercises + routines) state, so
+peak memory is set by the batch size, not the log size. Results match
+the in-memory engine functions on the concatenated log.
+"""
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from .config import RECOVERY_TAU
+from .compact import as_frame
+from .core import collapse_to_tier1, exercise_codes, exercise_volume
+from .model import MODEL
+from .recovery import (
+    NAT,
+    last_dates_by_exercise,
+    group_last_dates,
+    recovery_from_last_dates,
+    readiness_from_recovery
+)
+
+
+class FineMuscleAggregator:
+    """
+    Streaming compute_muscle_contribution / collapse_to_tier1.
+    """
+
+    def __init__(self):
+        n = len(MODEL.exercises)
+        self.volume = np.zeros(n)
+        self.present = np.zeros(n, dtype=bool)
+
+    def update(self, batch):
+        if batch.empty:
+            return
+
+        codes = exercise_codes(batch)
+        n = len(MODEL.exercises)
+
+        self.volume += np.bincount(codes, weights=exercise_volume(batch, codes), minlength=n)
+        self.present |= np.bincount(codes, minlength=n) > 0
+
+    def fine_scores(self):
+        scores = defaultdict(float)
+
+        muscle_scores = self.volume @ MODEL.weights
+        touched = (self.present @ (MODEL.weights > 0)) > 0
+
+        for j in np.flatnonzero(touched):
+            scores[MODEL.muscles[j]] = float(muscle_scores[j])
+
+        return scores
+
+    def tier1_scores(self):
+        return collapse_to_tier1(self.fine_scores())
+
+
+class RoutineIntensityAggregator:
+    """
+    Streaming routine_intensity_contribution (routines kept in order
+    of first appearance).
+    """
+
+    def __init__(self):
+        self.scores = {}
+
+    def update(self, batch):
+        if batch.empty:
+            return
+
+        codes = exercise_codes(batch, strict=False)
+        volume = pd.Series(exercise_volume(batch, codes), index=batch.index)
+
+        totals = volume.groupby(batch["routine"], sort=False, observed=True).sum()
+
+        for routine, score in totals.items():
+            self.scores[routine] = self.scores.get(routine, 0.0) + score
+
+    def result(self):
+        return pd.DataFrame(
+            self.scores.items(),
+            columns=["Routine", "Intensity Score"]
+        )
+
+
+class PushPullAggregator:
+    """
+    Streaming exercise_wise_push_pull.
+    """
+
+    def __init__(self):
+        self.push = 0.0
+        self.pull = 0.0
+
+    def update(self, batch):
+        if batch.empty:
+            return
+
+        codes = exercise_codes(batch, strict=False)
+        volume = exercise_volume(batch, codes)
+        intent = MODEL.intent_of(codes)
+
+        self.push += volume[intent == MODEL.intents.index("push")].sum()
+        self.pull += volume[intent == MODEL.intents.index("pull")].sum()
+
+    def result(self):
+        return float(self.push), float(self.pull)
+
+
+class LastTrainedAggregator:
+    """
+    Streaming last-trained dates per exercise, reduced to Tier-1
+    groups for recovery / readiness.
+    """
+
+    def __init__(self):
+        self.last_by_ex = np.full(len(MODEL.exercises), NAT, dtype=np.int64)
+
+    def update(self, batch):
+        np.maximum(self.last_by_ex, last_dates_by_exercise(batch), out=self.last_by_ex)
+
+    def last_dates(self, groups=None):
+        groups = list(RECOVERY_TAU) if groups is None else list(groups)
+        return pd.Series(group_last_dates(self.last_by_ex, groups), index=groups)
+
+    def recovery(self, reference_date=None):
+        groups = list(RECOVERY_TAU)
+        last = group_last_dates(self.last_by_ex, groups)
+        return recovery_from_last_dates(last, groups, reference_date)
+
+    def readiness(self, reference_date=None, alpha=1.5):
+        return readiness_from_recovery(self.recovery(reference_date), alpha)
+
+
+class StreamingAnalytics:
+    """
+    Feeds each batch to every aggregator above.
+    """
+
+    def __init__(self):
+        self.muscles = FineMuscleAggregator()
+        self.routines = RoutineIntensityAggregator()
+        self.push_pull = PushPullAggregator()
+        self.last_trained = LastTrainedAggregator()
+        self.rows = 0
+
+    def update(self, batch):
+        batch = as_frame(batch)
+
+        self.muscles.update(batch)
+        self.routines.update(batch)
+        self.push_pull.update(batch)
+        self.last_trained.update(batch)
+        self.rows += len(batch)
+
+    def consume(self, batches):
+        for batch in batches:
+            self.update(batch)
+        return self
@@ -0,0 +1,250 @@
+# engine/summary.py
+"""
+Materialized per-session summary table.
+
+One row per (session date, routine) holding the fine-muscle scores,
+Tier-1 scores, routine intensity and push/pull volume of that slice of
+the raw log. Every column is additive, so windowed queries sum the rows
+of the last N session dates instead of rescanning exercise rows.
+"""
+import numpy as np
+import pandas as pd
+from .config import SESSION_WINDOWS
+from .core import exercise_codes, exercise_volume, log_dates
+from .model import MODEL
+from .compact import accepts_compact
+from .profiling import profiled
+
+FINE_COLUMNS = [f"fine:{m}" for m in MODEL.muscles]
+TIER1_COLUMNS = [f"tier1:{g}" for g in MODEL.tier1_groups]
+
+SUMMARY_COLUMNS = (
+    ["date", "routine", "routine_intensity", "push_volume", "pull_volume"]
+    + FINE_COLUMNS
+    + TIER1_COLUMNS
+)
+
+PUSH = MODEL.intent_codes == MODEL.intents.index("push")
+PULL = MODEL.intent_codes == MODEL.intents.index("pull")
+
+
+@profiled
+@accepts_compact
+def summarize_sessions(log_df):
+    """
+    Raw log rows → summary rows, one per (date, routine).
+    """
+    if log_df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    codes = exercise_codes(log_df)
+    volume = exercise_volume(log_df, codes)
+    dates = log_dates(log_df).to_numpy()
+    routines = log_df["routine"].to_numpy()
+
+    # (date, routine) x exercise volume matrix
+    per_exercise = (
+        pd.Series(volume)
+        .groupby([dates, routines, codes]).sum()
+        .unstack(fill_value=0.0)
+        .reindex(columns=range(len(MODEL.exercises)), fill_value=0.0)
+    )
+
+    matrix = per_exercise.to_numpy()
+    fine = matrix @ MODEL.weights
+
+    summary = pd.DataFrame({
+        "date": per_exercise.index.get_level_values(0),
+        "routine": per_exercise.index.get_level_values(1),
+        "routine_intensity": matrix.sum(axis=1),
+        "push_volume": matrix[:, PUSH].sum(axis=1),
+        "pull_volume": matrix[:, PULL].sum(axis=1),
+    })
+
+    summary[FINE_COLUMNS] = fine
+    summary[TIER1_COLUMNS] = fine @ MODEL.collapse
+
+    return summary
+
+
+def _summary_dates(summary_df):
+    dates = summary_df["date"]
+
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    return dates.to_numpy()
+
+
+def sorted_summary(summary_df):
+    """
+    Summary rows in date order (stable), dates typed, so windows are
+    slices.
+    """
+    if summary_df.empty:
+        return summary_df
+
+    summary_df = summary_df.assign(date=_summary_dates(summary_df))
+
+    if not summary_df["date"].is_monotonic_increasing:
+        summary_df = summary_df.sort_values("date", kind="stable")
+    return summary_df.reset_index(drop=True)
+
+
+def summary_window(summary_df, start=None, end=None):
+    """
+    Rows of a date-sorted summary with start <= date <= end.
+    """
+    if summary_df.empty or (start is None and end is None):
+        return summary_df
+
+    dates = _summary_dates(summary_df)
+    lo = 0 if start is None else np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), "left")
+    hi = len(dates) if end is None else np.searchsorted(dates, pd.Timestamp(end).to_datetime64(), "right")
+
+    return summary_df.iloc[lo:max(lo, hi)]
+
+
+def last_n_summary(summary_df, n):
+    """
+    Summary rows belonging to the last n session dates of a date-sorted
+    summary: one binary search from the end, no full-table scan.
+    """
+    if summary_df.empty or n <= 0:
+        return summary_df.iloc[:0]
+
+    dates = _summary_dates(summary_df)
+
+    # walk back over the last n distinct dates
+    first = len(dates)
+    for _ in range(n):
+        if first == 0:
+            break
+        first = np.searchsorted(dates, dates[first - 1], "left")
+
+    return summary_df.iloc[first:]
+
+
+def summary_is_current(summary_df, log_df, tolerance=1e-6):
+    """
+    Cheap staleness check of a stored summary against the raw log: the
+    same session dates, total volume and per-muscle / Tier-1 totals
+    under the current MODEL, so a summary written before an edit of
+    the exercise library (weights or collapse map) is stale.
+    check_summary compares every cell.
+    """
+    if summary_df.empty or log_df.empty:
+        return summary_df.empty and log_df.empty
+
+    if not set(FINE_COLUMNS + TIER1_COLUMNS) <= set(summary_df.columns):
+        return False
+
+    codes = exercise_codes(log_df, strict=False)
+    volume = exercise_volume(log_df, codes)
+    total = volume.sum()
+
+    log_days = np.unique(log_dates(log_df).to_numpy().astype("datetime64[D]"))
+    summary_days = np.unique(_summary_dates(summary_df).astype("datetime64[D]"))
+
+    if not np.array_equal(log_days, summary_days):
+        return False
+
+    # unknown exercises (code -1) land in the extra last bin
+    n = len(MODEL.exercises)
+    per_exercise = np.bincount(codes % (n + 1), weights=volume, minlength=n + 1)[:n]
+    fine = per_exercise @ MODEL.weights
+
+    expected = np.concatenate([[total], fine, fine @ MODEL.collapse])
+    stored = summary_df[["routine_intensity"] + FINE_COLUMNS + TIER1_COLUMNS].sum().to_numpy(dtype=float)
+
+    return bool(np.all(np.abs(stored - expected) <= tolerance * max(1.0, total)))
+
+
+def _scores(window_df, columns, prefix, label):
+    totals = window_df[columns].sum()
+    totals = totals[totals > 0]
+
+    return pd.DataFrame({
+        label: [c[len(prefix):] for c in totals.index],
+        "Intensity Score": totals.to_numpy(dtype=float)
+    }).sort_values("Intensity Score", ascending=False)
+
+
+def aggregate_summary_by_sessions(summary_df, window_name="weekly"):
+    """
+    Summary-table equivalent of aggregation.aggregate_by_sessions.
+    """
+    window_df = last_n_summary(summary_df, SESSION_WINDOWS[window_name])
+    return _scores(window_df, TIER1_COLUMNS, "tier1:", "Muscle Group")
+
+
+def fine_scores_from_summary(summary_df, window_name="weekly"):
+    window_df = last_n_summary(summary_df, SESSION_WINDOWS[window_name])
+    totals = window_df[FINE_COLUMNS].sum()
+
+    return {
+        c[len("fine:"):]: float(v)
+        for c, v in totals.items() if v > 0
+    }
+
+
+def aggregate_summary_routine_by_sessions(summary_df, window_name="weekly"):
+    """
+    Summary-table equivalent of aggregation.aggregate_routine_by_sessions.
+    """
+    window_df = last_n_summary(summary_df, SESSION_WINDOWS[window_name])
+    totals = window_df.groupby("routine", sort=False)["routine_intensity"].sum()
+
+    return pd.DataFrame({
+        "Routine": totals.index,
+        "Intensity Score": totals.to_numpy(dtype=float)
+    })
+
+
+def summary_push_pull(summary_df):
+    return (
+        float(summary_df["push_volume"].sum()),
+        float(summary_df["pull_volume"].sum())
+    )
+
+
+@profiled
+@accepts_compact
+def check_summary(summary_df, log_df, tolerance=1e-6):
+    """
+    Compares a stored summary against one rebuilt from the raw log.
+    Returns the mismatching cells (date, routine, column, stored,
+    expected); an empty frame means the table is consistent.
+    """
+    expected = summarize_sessions(log_df)
+    keys = ["date", "routine"]
+    values = [c for c in SUMMARY_COLUMNS if c not in keys]
+
+    def merged(df):
+        df = df.copy()
+        df["date"] = pd.to_datetime(df["date"])
+        df["routine"] = df["routine"].astype(str)
+        return df.groupby(keys)[values].sum()
+
+    stored = merged(summary_df)
+    rebuilt = merged(expected)
+
+    index = stored.index.union(rebuilt.index)
+    stored = stored.reindex(index, fill_value=np.nan)
+    rebuilt = rebuilt.reindex(index, fill_value=np.nan)
+
+    diff = (stored - rebuilt).abs()
+    bad = (diff > tolerance) | (stored.isna() != rebuilt.isna())
+
+    cells = bad.stack()
+    cells = cells[cells].index
+
+    return pd.DataFrame([
+        {
+            "date": date,
+            "routine": routine,
+            "column": column,
+            "stored": stored.at[(date, routine), column],
+            "expected": rebuilt.at[(date, routine), column],
+        }
+        for date, routine, column in cells
+    ], columns=["date", "routine", "column", "stored", "expected"])
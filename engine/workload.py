@@ -0,0 +1,142 @@
+# engine/workload.py
+"""
+Acute:chronic workload ratio (ACWR).
+
+Daily load per fine muscle is one bincount over (day, exercise) and a
+matrix multiply; Tier-1 load is a second multiply by the collapse
+matrix. Acute and chronic loads are exponentially weighted averages
+over calendar days (rest days count as zero load), computed for every
+column in one recursive pass with pandas ewm(adjust=False):
+
+    ema[t] = alpha * load[t] + (1 - alpha) * ema[t - 1]
+
+Pass one athlete's log at a time.
+"""
+import numpy as np
+import pandas as pd
+from .config import (
+    ACWR_ACUTE_DAYS,
+    ACWR_CHRONIC_DAYS,
+    ACWR_SWEET_SPOT,
+    ACWR_SPIKE
+)
+from .core import exercise_codes, exercise_volume, log_dates
+from .model import MODEL
+from .compact import accepts_compact
+from .profiling import profiled
+
+LEVELS = ("fine", "tier1")
+
+
+def _columns(level):
+    if level not in LEVELS:
+        raise ValueError(f"Unknown level: {level}")
+    return list(MODEL.muscles if level == "fine" else MODEL.tier1_groups)
+
+
+@profiled
+@accepts_compact
+def daily_muscle_load(log_df, end=None, level="tier1"):
+    """
+    Calendar-day load matrix (date x muscle), from the first logged
+    day to `end` (default: the last logged day), zeros on rest days.
+    """
+    columns = _columns(level)
+    dates = log_dates(log_df) if not log_df.empty else None
+
+    # unparseable dates (NaT) carry no calendar day, as in SessionIndex
+    if dates is not None and dates.isna().any():
+        valid = dates.notna().to_numpy()
+        log_df, dates = log_df[valid], dates[valid]
+
+    if log_df.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    days = dates.to_numpy().astype("datetime64[D]")
+    first = days.min()
+    last = days.max() if end is None else np.datetime64(pd.Timestamp(end), "D")
+
+    codes = exercise_codes(log_df)
+    volume = exercise_volume(log_df, codes)
+
+    keep = days <= last
+    codes, volume = codes[keep], volume[keep]
+    day = (days[keep] - first).astype(np.int64)
+
+    n_days = max(int((last - first).astype(np.int64)) + 1, 0)
+    n_ex = len(MODEL.exercises)
+
+    per_exercise = np.bincount(
+        day * n_ex + codes, weights=volume, minlength=n_days * n_ex
+    ).reshape(n_days, n_ex)
+
+    load = per_exercise @ MODEL.weights
+    if level == "tier1":
+        load = load @ MODEL.collapse
+
+    index = pd.date_range(pd.Timestamp(first), periods=n_days, freq="D", name="date")
+    return pd.DataFrame(load, index=index, columns=columns)
+
+
+def _ema(load, days):
+    return load.ewm(alpha=2 / (days + 1), adjust=False).mean()
+
+
+@profiled
+@accepts_compact
+def workload_series(log_df, end=None, level="tier1",
+                    acute_days=ACWR_ACUTE_DAYS, chronic_days=ACWR_CHRONIC_DAYS):
+    """
+    Daily acute EMA, chronic EMA and ACWR per muscle, as one frame with
+    (metric, muscle) columns. ACWR is NaN until the chronic window has
+    filled once and wherever the chronic load is zero.
+    """
+    load = daily_muscle_load(log_df, end, level)
+
+    acute = _ema(load, acute_days)
+    chronic = _ema(load, chronic_days)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = acute / chronic.where(chronic > 0)
+
+    # the chronic EMA starts at the first day's load; too short a history
+    # gives meaningless ratios
+    ratio.iloc[:chronic_days - 1] = np.nan
+
+    return pd.concat({"acute": acute, "chronic": chronic, "acwr": ratio}, axis=1)
+
+
+def acwr_flag(ratio):
+    if np.isnan(ratio):
+        return "Insufficient history"
+    if ratio > ACWR_SPIKE:
+        return "Spike risk"
+    if ratio > ACWR_SWEET_SPOT[1]:
+        return "Elevated"
+    if ratio >= ACWR_SWEET_SPOT[0]:
+        return "Sweet spot"
+    return "Underloaded"
+
+
+@profiled
+@accepts_compact
+def acwr_status(log_df, reference_date=None, level="tier1"):
+    """
+    Acute / chronic load, ACWR and a risk flag per muscle on
+    `reference_date` (default: the last logged day).
+    """
+    series = workload_series(log_df, end=reference_date, level=level)
+
+    if series.empty:
+        return pd.DataFrame(columns=["Acute", "Chronic", "ACWR", "Status"])
+
+    latest = series.iloc[-1]
+
+    status_df = pd.DataFrame({
+        "Acute": latest["acute"],
+        "Chronic": latest["chronic"],
+        "ACWR": latest["acwr"],
+    })
+    status_df["Status"] = status_df["ACWR"].map(acwr_flag)
+
+    return status_df
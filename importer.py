@@ -0,0 +1,167 @@
+# importer.py
+"""
+Bulk session import from other trackers.
+
+Accepts JSON Lines or CSV with columns
+    date, routine, exercise, sets, reps [, athlete]
+validates every row in vectorized batches (exercise in
+EXERCISE_LIBRARY, routine in ROUTINES, positive integer sets/reps,
+parseable date), normalizes dates and commits all accepted rows with a
+single save_session call. Rejected rows are returned with their line
+number and reasons.
+
+    python importer.py export.jsonl --rejections rejected.csv
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+from logger import CSV_PATH, STORAGE_BACKEND, ROUTINES, save_session
+from csvlog import check_athlete
+from storage import DEFAULT_ATHLETE, parse_log_dates
+from engine.model import MODEL
+
+REQUIRED_COLUMNS = ["date", "routine", "exercise", "sets", "reps"]
+
+
+def read_import_file(path, fmt=None):
+    """
+    Reads a .jsonl / .json (JSON Lines) or .csv file. Text columns stay
+    raw; clean numeric columns parse natively and dirty ones fall back to
+    object, so validation does the typing.
+    """
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    if fmt == "csv":
+        text = {c: str for c in ["athlete", "date", "routine", "exercise"]}
+        return pd.read_csv(path, dtype=text)
+    if fmt == "jsonl":
+        return pd.read_json(path, lines=True, dtype=False, convert_dates=False)
+
+    raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _valid_athlete(athlete):
+    # athlete ids become directory names
+    try:
+        check_athlete(athlete)
+    except ValueError:
+        return False
+    return True
+
+
+def _positive_int(values):
+    numbers = pd.to_numeric(values, errors="coerce")
+    ok = numbers.notna() & (numbers >= 1) & (numbers == np.floor(numbers))
+    return numbers.where(ok), ok
+
+
+def validate_rows(raw_df):
+    """
+    Returns (accepted, rejections).
+
+    accepted   : typed log rows ready for save_session
+    rejections : line | reason  (line = 1-based data row in the file)
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in raw_df.columns]
+    if missing:
+        raise ValueError(f"Import is missing columns: {', '.join(missing)}")
+
+    text = {
+        c: raw_df[c].astype(str).str.strip().where(raw_df[c].notna(), "")
+        for c in ["routine", "exercise", "date"]
+    }
+
+    routine = text["routine"].str.lower()
+    exercise = text["exercise"]
+    dates = parse_log_dates(text["date"].mask(text["date"] == ""))
+    sets, sets_ok = _positive_int(raw_df["sets"])
+    reps, reps_ok = _positive_int(raw_df["reps"])
+
+    if "athlete" in raw_df.columns:
+        athlete = raw_df["athlete"].astype(str).str.strip().where(raw_df["athlete"].notna(), "")
+        athlete = athlete.mask(athlete == "", DEFAULT_ATHLETE)
+    else:
+        athlete = pd.Series(DEFAULT_ATHLETE, index=raw_df.index)
+
+    valid_ids = {a: _valid_athlete(a) for a in athlete.unique()}
+
+    checks = {
+        "invalid date": dates.notna(),
+        "unknown routine": routine.isin(list(ROUTINES)),
+        "unknown exercise": exercise.isin(MODEL.exercises),
+        "invalid sets": sets_ok,
+        "invalid reps": reps_ok,
+        "invalid athlete": athlete.map(valid_ids).astype(bool),
+    }
+
+    failed = pd.DataFrame({reason: ~ok.to_numpy() for reason, ok in checks.items()})
+    rejected = failed.any(axis=1).to_numpy()
+
+    accepted = pd.DataFrame({
+        "athlete": athlete,
+        "date": dates,
+        "routine": routine,
+        "exercise": exercise,
+        "sets": sets,
+        "reps": reps,
+    })[~rejected]
+
+    accepted = accepted.astype({"sets": "int64", "reps": "int64"})
+    accepted = accepted.sort_values(["athlete", "date"], kind="stable").reset_index(drop=True)
+
+    bad = failed[rejected]
+    reasons = pd.Series("", index=bad.index)
+    for reason in bad.columns:
+        reasons += np.where(bad[reason], reason + "; ", "")
+
+    rejections = pd.DataFrame({
+        "line": np.flatnonzero(rejected) + 1,
+        "reason": reasons.str.rstrip("; ").to_numpy(),
+    })
+
+    return accepted, rejections
+
+
+def import_sessions(source, path=CSV_PATH, backend=STORAGE_BACKEND,
+                    summary_path="auto", fmt=None, dry_run=False):
+    """
+    Validates `source` (a file path or a raw DataFrame) and commits
+    every accepted row in one write. Returns (accepted, rejections).
+    """
+    raw_df = source if isinstance(source, pd.DataFrame) else read_import_file(source, fmt)
+    accepted, rejections = validate_rows(raw_df)
+
+    if not dry_run and not accepted.empty:
+        save_session(accepted, path=path, backend=backend, summary_path=summary_path)
+
+    return accepted, rejections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import workout sessions")
+    parser.add_argument("source", help="JSON Lines or CSV file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--path", default=CSV_PATH)
+    parser.add_argument("--backend", default=STORAGE_BACKEND)
+    parser.add_argument("--rejections", help="write the rejection report to this CSV")
+    parser.add_argument("--dry-run", action="store_true", help="validate only")
+    args = parser.parse_args()
+
+    accepted, rejections = import_sessions(
+        args.source, path=args.path, backend=args.backend,
+        fmt=args.format, dry_run=args.dry_run
+    )
+
+    action = "Validated" if args.dry_run else "Imported"
+    print(f"{action} {len(accepted)} rows, rejected {len(rejections)}")
+
+    if args.rejections:
+        rejections.to_csv(args.rejections, index=False)
+    elif not rejections.empty:
+        print(rejections.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
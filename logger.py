@@ -1,58 +1,35 @@
 # logger.py
 import os
+from functools import partial
 import pandas as pd
 from datetime import datetime
-
-CSV_PATH = "workout_log.csv"
-
-# ==============================
-# ROUTINE DEFINITIONS (ORDERED)
-# ==============================
-
-ROUTINES = {
-    "push": [
-        "Push-up",
-        "DB Bench Press",
-        "DB Shoulder Press",
-        "Lateral Raise",
-        "DB Triceps Extension",
-        "Diamond Push-up",     
-        "Decline Push-up"
-    ],
-
-    "pull": [
-        "Dead Hang",
-        "Scapular Pull-up",
-        "Negative Pull-up",
-        "One-arm DB Row",
-        "Bent-over DB Row",
-        "DB Shrug",
-        "Rear Delt Fly",
-        "DB Curl",
-        "Hammer Curl",
-        "Superman"
-    ],
-
-    "core": [
-        "Goblet Squat",
-        "Lunge",
-        "High Knees",
-        "Hanging Knee Raise",
-        "Plank",
-        "Active Hang",
-        "Leg Raise",
-        "Russian Twist",
-        "DB Side Bends",
-        "Glute Bridge", 
-        "Mountain Climber",
-        "Burpee"
-    ]
-}
+from csvlog import CSV_PATH, SUMMARY_PATH, STORAGE_BACKEND, resolve_summary_path
+from storage import (
+    DEFAULT_ATHLETE,
+    HeaderMismatch,
+    append_csv,
+    athlete_path,
+    date_indexed,
+    list_athletes,
+    open_storage
+)
+from engine.config import ROUTINES
+from engine.compact import CompactLog
+from engine.model import encode_log
+from engine.profiling import profiled
+from engine.summary import (
+    check_summary,
+    sorted_summary,
+    summarize_sessions,
+    summary_is_current
+)
 
 
 def log_workout_session():
     print("\n=== WORKOUT LOGGER (GUIDED) ===")
 
+    athlete = input(f"Athlete ID [blank = {DEFAULT_ATHLETE}]: ").strip() or DEFAULT_ATHLETE
+
     date_input = input("Date (YYYY-MM-DD) [blank = today]: ")
     date = datetime.today().date() if not date_input else pd.to_datetime(date_input).date()
 
@@ -86,6 +63,7 @@ def log_workout_session():
             continue
 
         logs.append({
+            "athlete": athlete,
             "date": date,
             "routine": routine,
             "exercise": exercise,
@@ -104,11 +82,165 @@ def log_workout_session():
 
 
 
-def save_session(df, path=CSV_PATH):
-    df.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+def _split_by_athlete(df, athlete=None):
+    if "athlete" in df.columns:
+        return list(df.groupby("athlete", sort=False))
+    return [(athlete or DEFAULT_ATHLETE, df)]
+
+
+@profiled
+def save_session(df, path=CSV_PATH, backend=STORAGE_BACKEND,
+                 summary_path="auto", athlete=None):
+    """
+    Appends rows to each athlete's partition (taken from the athlete
+    column, else `athlete`) and updates their session summaries
+    (summary_path: "auto" = beside the log, None = none).
+
+    Every part is summarized before anything is written, so a row the
+    summary rejects (unknown exercise → KeyError) leaves both the log
+    and the summary untouched. A summary written under another exercise
+    library (different muscle columns) is rebuilt from the log.
+    """
+    summary_path = resolve_summary_path(path, summary_path)
+
+    parts = [
+        (athlete_id, part, summarize_sessions(part))
+        for athlete_id, part in _split_by_athlete(df, athlete)
+    ]
+
+    for athlete_id, part, summary in parts:
+        open_storage(path, backend, athlete_id).append(part)
+
+        if summary_path is None or part.empty:
+            continue
+
+        try:
+            append_csv(athlete_path(summary_path, athlete_id), summary)
+        except HeaderMismatch:
+            rebuild_session_summary(path, summary_path, backend, athlete_id)
+
+
+@profiled
+def load_history(path=CSV_PATH, start=None, end=None, routines=None,
+                 backend=STORAGE_BACKEND, athlete=None):
+    """
+    Loads one athlete's log, optionally restricted to [start, end] and
+    a set of routines. The parquet backend only reads matching partitions.
+    exercise / routine come back as categoricals coded like engine.model;
+    rows are sorted on a DatetimeIndex (the date column is kept).
+    """
+    log_df = open_storage(path, backend, athlete).load(start, end, routines)
+    return encode_log(date_indexed(log_df), ROUTINES)
+
+
+def load_compact_history(path=CSV_PATH, start=None, end=None, routines=None,
+                         backend=STORAGE_BACKEND, athlete=None):
+    """
+    load_history as an array-backed engine.compact.CompactLog (for
+    holding many athletes' logs in one process).
+    """
+    return CompactLog.from_frame(
+        load_history(path, start, end, routines, backend, athlete)
+    )
+
+
+def iter_history(path=CSV_PATH, chunksize=100_000, start=None, end=None,
+                 routines=None, backend=STORAGE_BACKEND, athlete=None):
+    """
+    Streams one athlete's log as typed batches of at most `chunksize`
+    rows (for engine.streaming), so the whole log is never in memory.
+    """
+    storage = open_storage(path, backend, athlete)
+
+    for batch in storage.iter_batches(chunksize, start, end, routines):
+        yield encode_log(batch, ROUTINES)
+
+
+def load_athlete(athlete, path=CSV_PATH, backend=STORAGE_BACKEND):
+    return load_history(path, backend=backend, athlete=athlete)
+
+
+def load_all_history(path=CSV_PATH, backend=STORAGE_BACKEND):
+    """
+    Every athlete's log in one frame (athlete column included).
+    """
+    logs = [load_athlete(a, path, backend) for a in list_athletes(path, backend)]
+    logs = [df for df in logs if not df.empty]
+
+    if not logs:
+        return pd.DataFrame()
+    return pd.concat(logs, ignore_index=True)
+
+
+def score_all_athletes(path=CSV_PATH, backend=STORAGE_BACKEND, max_workers=None):
+    """
+    Nightly batch: dashboard metrics for every athlete, computed in a
+    process pool with each worker loading its own athletes' partitions.
+    """
+    from engine.batch import batch_athlete_metrics
+
+    return batch_athlete_metrics(
+        list_athletes(path, backend),
+        loader=partial(load_athlete, path=path, backend=backend),
+        max_workers=max_workers
+    )
+
+
+# ==============================
+# SESSION SUMMARY TABLE
+# ==============================
 
+def load_session_summary(summary_path=SUMMARY_PATH, athlete=None):
+    """
+    The stored summary table, sorted by date.
+    """
+    summary_path = athlete_path(summary_path, athlete)
 
-def load_history(path=CSV_PATH):
-    if not os.path.exists(path):
+    if not os.path.exists(summary_path):
         return pd.DataFrame()
-    return pd.read_csv(path, parse_dates=["date"])
+    return sorted_summary(pd.read_csv(summary_path, parse_dates=["date"]))
+
+
+def current_session_summary(log_df, path=CSV_PATH, summary_path="auto", athlete=None):
+    """
+    Summary table for window queries over `log_df` (that athlete's
+    loaded log): the stored one if it is current, else rebuilt in
+    memory from the log (older logs, or rows written without it).
+    """
+    summary_path = resolve_summary_path(path, summary_path)
+
+    if summary_path is not None:
+        summary = load_session_summary(summary_path, athlete)
+        if summary_is_current(summary, log_df):
+            return summary
+
+    return sorted_summary(summarize_sessions(log_df))
+
+
+def rebuild_session_summary(path=CSV_PATH, summary_path="auto",
+                            backend=STORAGE_BACKEND, athlete=None):
+    """
+    Recomputes the summary table from the raw log, replacing any
+    existing file. Returns the number of summary rows written.
+    """
+    summary = summarize_sessions(load_history(path, backend=backend, athlete=athlete))
+    summary_path = athlete_path(resolve_summary_path(path, summary_path), athlete)
+
+    folder = os.path.dirname(summary_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    summary.to_csv(summary_path, index=False)
+    return len(summary)
+
+
+def verify_session_summary(path=CSV_PATH, summary_path="auto",
+                           backend=STORAGE_BACKEND, athlete=None):
+    """
+    Mismatches between the stored summary and the raw log
+    (empty DataFrame when consistent).
+    """
+    return check_summary(
+        load_session_summary(resolve_summary_path(path, summary_path), athlete),
+        load_history(path, backend=backend, athlete=athlete)
+    )
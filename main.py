@@ -9,14 +9,20 @@ Flow:
 4. Collapse to Tier-1 muscle groups
 5. Visualize muscle balance
 6. (Optional) Inspect sub-muscle coverage
+
+quicklog.py runs steps 1-2 with the standard library only and loads
+this module (pandas, NumPy, matplotlib) only if the report is wanted.
 """
 
 # --------- IMPORTS ----------
 from logger import (
+    CSV_PATH,
     log_workout_session,
     save_session
 )
 
+from storage import repair_csv
+
 from engine.core import (
     compute_muscle_contribution,
     collapse_to_tier1,
@@ -25,6 +31,8 @@ from engine.core import (
 
 from visuals import radar_plot
 
+RADAR_PATH = "session_radar.png"
+
 
 # ==============================
 # MAIN EXECUTION
@@ -32,6 +40,10 @@ from visuals import radar_plot
 
 def main():
 
+    # ---- 0. RECOVER A TORN TAIL FROM A CRASHED WRITER ----
+    if repair_csv(CSV_PATH):
+        print("⚠ Dropped an incomplete last row from the log.")
+
     # ---- 1. LOG WORKOUT SESSION ----
     session_df = log_workout_session()
 
@@ -43,6 +55,14 @@ def main():
     save_session(session_df)
     print("\n💾 Session saved successfully.")
 
+    session_report(session_df)
+
+
+def session_report(session_df):
+    """
+    Steps 3-6 for a logged session (also used by quicklog.py once the
+    user asks for the report).
+    """
     # ---- 3. COMPUTE MUSCLE CONTRIBUTION (FINE) ----
     fine_scores = compute_muscle_contribution(session_df)
 
@@ -53,7 +73,8 @@ def main():
     print(tier1_df)
 
     # ---- 5. VISUALIZE MUSCLE BALANCE ----
-    radar_plot(tier1_df, title="Session Muscle Balance")
+    radar_plot(tier1_df, title="Session Muscle Balance", path=RADAR_PATH)
+    print(f"\n📈 Radar chart saved to {RADAR_PATH}")
 
     # ---- 6. OPTIONAL: SUB-MUSCLE COVERAGE CHECK ----
     VALID_GROUPS = [
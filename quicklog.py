@@ -0,0 +1,214 @@
+# quicklog.py
+"""
+Fast-start workout logger.
+
+Collects a session and appends it (plus its summary row) using only
+the standard library, so the first prompt appears without importing
+pandas, NumPy or matplotlib. The analysis report (main.session_report)
+is imported only if the user asks for it afterwards.
+
+    python quicklog.py
+
+The summary row is computed here in plain Python from engine.config;
+it mirrors engine.summary.summarize_sessions (verify with
+`python storage.py summary-check`). Non-CSV backends fall back to
+logger.save_session.
+"""
+from datetime import date as Date
+
+from csvlog import (
+    CSV_PATH,
+    STORAGE_BACKEND,
+    DEFAULT_ATHLETE,
+    HeaderMismatch,
+    append_rows,
+    athlete_path,
+    check_athlete,
+    repair_csv,
+    resolve_summary_path
+)
+from engine import config
+from engine.config import ROUTINES
+
+LOG_COLUMNS = ["date", "routine", "exercise", "sets", "reps"]
+
+_summary_columns = []
+
+
+def summary_columns():
+    """
+    Same column order as engine.model.compile_model / engine.summary.
+    Built on first save, so reading the library JSON stays off the
+    path to the first prompt.
+    """
+    if not _summary_columns:
+        muscles = dict.fromkeys(
+            m for spec in config.EXERCISE_LIBRARY.values() for m in spec["muscles"]
+        )
+        groups = dict.fromkeys(config.MUSCLE_COLLAPSE_MAP.values())
+
+        _summary_columns.extend(
+            ["date", "routine", "routine_intensity", "push_volume", "pull_volume"]
+            + [f"fine:{m}" for m in muscles]
+            + [f"tier1:{g}" for g in groups]
+        )
+
+    return _summary_columns
+
+
+# ==============================
+# SESSION INPUT
+# ==============================
+
+def collect_session():
+    """
+    Guided prompts, as logger.log_workout_session. Returns
+    (athlete, rows) with rows as dicts of LOG_COLUMNS.
+    """
+    print("\n=== WORKOUT LOGGER (GUIDED) ===")
+
+    athlete = input(f"Athlete ID [blank = {DEFAULT_ATHLETE}]: ").strip() or DEFAULT_ATHLETE
+    check_athlete(athlete)
+
+    date_input = input("Date (YYYY-MM-DD) [blank = today]: ").strip()
+    date = Date.today() if not date_input else Date.fromisoformat(date_input)
+
+    routine = input("Routine (push / pull / core): ").strip().lower()
+
+    if routine not in ROUTINES:
+        raise ValueError("Invalid routine")
+
+    print(f"\nLogging routine: {routine.upper()}")
+    print("Enter sets/reps for each exercise.")
+    print("Press ENTER to skip an exercise.\n")
+
+    rows = []
+
+    for exercise in ROUTINES[routine]:
+
+        print(f"→ {exercise}")
+
+        sets_input = input("  Sets (blank = skip): ").strip()
+        if sets_input == "":
+            print("  ⏭ Skipped\n")
+            continue
+
+        reps_input = input("  Reps: ").strip()
+
+        try:
+            sets = int(sets_input)
+            reps = int(reps_input)
+        except ValueError:
+            print("  ❌ Invalid input, skipping\n")
+            continue
+
+        rows.append({
+            "date": date.isoformat(),
+            "routine": routine,
+            "exercise": exercise,
+            "sets": sets,
+            "reps": reps
+        })
+
+        print("  ✔ Logged\n")
+
+    print("\n=== SESSION COMPLETE ===")
+    for row in rows:
+        print(f"  {row['exercise']:<24} {row['sets']} x {row['reps']}")
+
+    return athlete, rows
+
+
+# ==============================
+# SUMMARY ROWS (PURE PYTHON)
+# ==============================
+
+def summary_rows(rows):
+    """
+    One summary row per (date, routine), as summarize_sessions.
+    """
+    groups = {}
+
+    for row in rows:
+        key = (row["date"], row["routine"])
+        summary = groups.get(key)
+
+        if summary is None:
+            summary = dict.fromkeys(summary_columns()[2:], 0.0)
+            summary.update(date=row["date"], routine=row["routine"])
+            groups[key] = summary
+
+        exercise = row["exercise"]
+        volume = row["sets"] * row["reps"] * config.DEFAULT_LOAD.get(exercise, 1.0)
+
+        summary["routine_intensity"] += volume
+
+        intent = config.EXERCISE_INTENT.get(exercise, "neutral")
+        if intent in ("push", "pull"):
+            summary[f"{intent}_volume"] += volume
+
+        for muscle, weight in config.EXERCISE_LIBRARY[exercise]["muscles"].items():
+            summary[f"fine:{muscle}"] += volume * weight
+            summary[f"tier1:{config.MUSCLE_COLLAPSE_MAP[muscle]}"] += volume * weight
+
+    return list(groups.values())
+
+
+def save_rows(rows, athlete=DEFAULT_ATHLETE, path=CSV_PATH,
+              summary_path="auto", backend=STORAGE_BACKEND):
+    if backend != "csv":
+        import pandas as pd
+        from logger import save_session
+
+        save_session(pd.DataFrame(rows), path=path, backend=backend,
+                     summary_path=summary_path, athlete=athlete)
+        return
+
+    summary_path = resolve_summary_path(path, summary_path)
+    summaries = summary_rows(rows)
+
+    append_rows(athlete_path(path, athlete), LOG_COLUMNS, rows)
+
+    if summary_path is None:
+        return
+
+    try:
+        append_rows(athlete_path(summary_path, athlete), summary_columns(), summaries)
+    except HeaderMismatch:
+        # summary written under another exercise library
+        from logger import rebuild_session_summary
+
+        rebuild_session_summary(path, summary_path, backend, athlete)
+
+
+# ==============================
+# MAIN EXECUTION
+# ==============================
+
+def main():
+    if STORAGE_BACKEND == "csv" and repair_csv(CSV_PATH):
+        print("⚠ Dropped an incomplete last row from the log.")
+
+    athlete, rows = collect_session()
+
+    if not rows:
+        print("⚠ No exercises logged. Exiting.")
+        return
+
+    save_rows(rows, athlete)
+    print("\n💾 Session saved successfully.")
+
+    if input("\nShow analysis report? (y/n): ").strip().lower() not in ("y", "yes"):
+        return
+
+    # heavy imports only from here on
+    import pandas as pd
+    from main import session_report
+
+    session_df = pd.DataFrame(rows)
+    session_df["date"] = pd.to_datetime(session_df["date"])
+    session_report(session_df)
+
+
+if __name__ == "__main__":
+    main()
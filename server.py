@@ -0,0 +1,564 @@
+# server.py
+"""
+Local HTTP JSON service over the analytics engine.
+
+Loads each athlete's log once and serves engine results from memory:
+
+    GET /tier1      fine-muscle and Tier-1 scores
+    GET /coverage   sub-muscle coverage, completeness, imbalance flags
+    GET /readiness  recovery / readiness per Tier-1 group
+    GET /aggregate  last-N-session muscle and routine totals (window=weekly|monthly)
+    GET /push-pull  exercise-wise push / pull volume and ratio
+    GET /progress   baseline → current → final, routine progression
+    GET /health     loaded logs and cache counters
+
+Every endpoint but /health takes athlete, start and end (YYYY-MM-DD).
+
+Encoded responses are cached under (log fingerprint, endpoint, query,
+today). Each request re-stats the log, rehashing it on a thread
+(cache.file_fingerprint) when size or mtime moved, so the first
+request after a write reloads it and never sees a stale result;
+a background poll reloads changed logs and re-warms the default
+queries before anyone asks. Engine work runs on one worker thread, so
+cached responses keep being served while a miss is computed, and
+identical concurrent misses share one computation.
+
+    python server.py --port 8765
+"""
+import os
+import sys
+import json
+import math
+import stat
+import asyncio
+import argparse
+import datetime
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+import numpy as np
+import pandas as pd
+
+from cache import LRUCache, file_fingerprint, named_cache
+from csvlog import CSV_PATH, STORAGE_BACKEND, DEFAULT_ATHLETE, athlete_path, check_athlete
+from logger import current_session_summary, load_history
+from storage import ISO_DATE, list_athletes
+from engine.config import SESSION_WINDOWS
+from engine.core import compute_muscle_contribution, collapse_to_tier1
+from engine.aggregation import exercise_wise_push_pull
+from engine.analysis import analysis_report
+from engine.recovery import unified_muscle_readiness
+from engine.sessions import SessionIndex
+from engine.summary import (
+    aggregate_summary_by_sessions,
+    aggregate_summary_routine_by_sessions,
+    summary_window
+)
+from engine.progress import (
+    BASELINE_ROUTINE,
+    BASELINE_MUSCLE,
+    compute_final_target,
+    compute_current_from_logs,
+    progress_ratio,
+    routine_progress_series
+)
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# seconds between checks for logs changed behind the server's back
+POLL_SECONDS = 2.0
+
+MAX_HEADER_BYTES = 16 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class NotFound(Exception):
+    pass
+
+
+# ==============================
+# JSON ENCODING
+# ==============================
+
+def _jsonable(value):
+    """
+    Engine results → plain JSON types: frames become lists of records,
+    dates ISO strings, NaN / inf null.
+    """
+    if isinstance(value, pd.DataFrame):
+        # keep a named index (e.g. readiness by Muscle Group), drop row numbers
+        value = value.reset_index(drop=all(name is None for name in value.index.names))
+        return [_jsonable(row) for row in value.to_dict("records")]
+    if isinstance(value, pd.Series):
+        return _jsonable(value.to_dict())
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return _jsonable(value.item())
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.strftime(ISO_DATE)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _encode(payload):
+    return json.dumps(_jsonable(payload), allow_nan=False).encode()
+
+
+def _ratio(a, b):
+    return a / b if b > 0 else None
+
+
+# ==============================
+# ENDPOINTS
+# ==============================
+# Each takes a Window (the date-filtered log, its SessionIndex and its
+# session summary rows) and the parsed query, and returns a JSON-able
+# payload.
+
+Window = namedtuple("Window", ["log", "sessions", "summary"])
+
+
+def tier1_payload(window, query):
+    fine_scores = compute_muscle_contribution(window.log)
+
+    return {
+        "fine": fine_scores,
+        "tier1": collapse_to_tier1(fine_scores),
+    }
+
+
+def coverage_payload(window, query):
+    return analysis_report(compute_muscle_contribution(window.log))
+
+
+def readiness_payload(window, query):
+    return {"readiness": unified_muscle_readiness(window.log)}
+
+
+def aggregate_payload(window, query):
+    name = query["window"]
+
+    # last-N windows read N sessions' summary rows, not exercise rows
+    return {
+        "window": name,
+        "sessions": SESSION_WINDOWS[name],
+        "muscles": aggregate_summary_by_sessions(window.summary, window_name=name),
+        "routines": aggregate_summary_routine_by_sessions(window.summary, window_name=name),
+    }
+
+
+def push_pull_payload(window, query):
+    push, pull = exercise_wise_push_pull(window.log)
+    return {"push": push, "pull": pull, "ratio": _ratio(push, pull)}
+
+
+def _progress_rows(current, baseline, final):
+    return {
+        name: {
+            "baseline": baseline.get(name, 0.0),
+            "current": current.get(name, 0.0),
+            "final": target,
+            **progress_ratio(current.get(name, 0.0), baseline.get(name, 0.0), target),
+        }
+        for name, target in final.items()
+    }
+
+
+def progress_payload(window, query):
+    final_muscle, final_routine = compute_final_target()
+    current_muscle, current_routine = compute_current_from_logs(window.sessions)
+
+    return {
+        "muscles": _progress_rows(current_muscle, BASELINE_MUSCLE, final_muscle),
+        "routines": _progress_rows(current_routine, BASELINE_ROUTINE, final_routine),
+        "series": routine_progress_series(window.log, BASELINE_ROUTINE, window=3),
+    }
+
+
+ENDPOINTS = {
+    "/tier1": tier1_payload,
+    "/coverage": coverage_payload,
+    "/readiness": readiness_payload,
+    "/aggregate": aggregate_payload,
+    "/push-pull": push_pull_payload,
+    "/progress": progress_payload,
+}
+
+QUERY_PARAMS = {"athlete", "start", "end", "window"}
+
+
+def _date_param(query, name):
+    value = query.get(name)
+    if not value:
+        return None
+
+    try:
+        return pd.Timestamp(value).strftime(ISO_DATE)
+    except ValueError:
+        raise ValueError(f"Invalid {name} date: {value!r}") from None
+
+
+def parse_query(query_string):
+    """
+    Query string → normalized (athlete, start, end, window), so
+    equivalent spellings share a cache entry.
+    """
+    query = dict(parse_qsl(query_string))
+
+    unknown = set(query) - QUERY_PARAMS
+    if unknown:
+        raise ValueError(f"Unknown query parameters: {', '.join(sorted(unknown))}")
+
+    athlete = query.get("athlete") or DEFAULT_ATHLETE
+    check_athlete(athlete)
+
+    window = query.get("window", "weekly")
+    if window not in SESSION_WINDOWS:
+        raise ValueError(f"Unknown window {window!r} (expected one of {', '.join(SESSION_WINDOWS)})")
+
+    return {
+        "athlete": athlete,
+        "start": _date_param(query, "start"),
+        "end": _date_param(query, "end"),
+        "window": window,
+    }
+
+
+# ==============================
+# SERVICE
+# ==============================
+
+class AnalyticsService:
+    """
+    Owns the loaded logs and the response cache. Cache and log state
+    are only touched on the event loop; the engine runs on `executor`.
+    """
+
+    def __init__(self, path=CSV_PATH, backend=STORAGE_BACKEND, poll_seconds=POLL_SECONDS):
+        self.path = path
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+
+        self.logs = {}  # athlete -> (fingerprint, (history, summary))
+        self.stamps = {}  # athlete -> ((size, mtime) or None, fingerprint)
+        self.responses = named_cache("server.responses", maxsize=1024, maxbytes=64 << 20)
+        self.inflight = {}
+
+        # date-filtered views, only used on the worker thread
+        self.windows = LRUCache(maxsize=16)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+
+    async def fingerprint(self, athlete):
+        """
+        file_fingerprint of the athlete's log, hashed on a thread so a
+        large log never stalls the event loop. A log file whose size and
+        mtime match the last hash reuses it. Raises FileNotFoundError.
+        """
+        path = athlete_path(self.path, athlete, self.backend)
+        info = os.stat(path)
+        stamp = None if stat.S_ISDIR(info.st_mode) else (info.st_size, info.st_mtime_ns)
+
+        known = self.stamps.get(athlete)
+        if stamp is not None and known is not None and known[0] == stamp:
+            return known[1]
+
+        loop = asyncio.get_running_loop()
+        fingerprint = await loop.run_in_executor(None, file_fingerprint, path)
+        self.stamps[athlete] = (stamp, fingerprint)
+        return fingerprint
+
+    async def _run(self, key, func, *args):
+        """
+        Runs func on the worker; concurrent calls with the same key
+        await the same result.
+        """
+        future = self.inflight.get(key)
+
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+
+        # a cancelled client must not cancel the shared computation
+        return await asyncio.shield(future)
+
+    # ---------- logs ----------
+
+    def _load(self, athlete, fingerprint):
+        stale = [k for k in self.windows.keys() if k[0][0] == fingerprint[0]]
+        for key in stale:
+            self.windows.discard(key)
+
+        history = load_history(self.path, backend=self.backend, athlete=athlete)
+        summary = current_session_summary(history, self.path, athlete=athlete)
+        return history, summary
+
+    async def history(self, athlete):
+        """
+        (fingerprint, (history, summary)) of the athlete's current log,
+        reloaded if the file changed since it was last read.
+        """
+        try:
+            fingerprint = await self.fingerprint(athlete)
+        except FileNotFoundError:
+            # only athletes with a log on disk are tracked (and polled)
+            self._forget(athlete)
+            raise NotFound(f"No workouts logged for athlete {athlete!r}")
+
+        loaded = self.logs.get(athlete)
+
+        if loaded is None or loaded[0] != fingerprint:
+            history = await self._run(("load", fingerprint), self._load, athlete, fingerprint)
+
+            loaded = self.logs.get(athlete)
+            if loaded is not None and loaded[0] != fingerprint:
+                self._drop_responses(loaded[0])
+
+            loaded = self.logs[athlete] = (fingerprint, history)
+
+        return loaded
+
+    def _forget(self, athlete):
+        self.stamps.pop(athlete, None)
+        loaded = self.logs.pop(athlete, None)
+        if loaded is not None:
+            self._drop_responses(loaded[0])
+
+    def _drop_responses(self, fingerprint):
+        for key in [k for k in self.responses.keys() if k[0] == fingerprint]:
+            self.responses.discard(key)
+
+    # ---------- results ----------
+
+    def _window(self, loaded, fingerprint, start, end):
+        key = (fingerprint, start, end)
+        window = self.windows.get(key)
+
+        if window is None:
+            history, summary = loaded
+            log = history
+            if start is not None or end is not None:
+                # sorted DatetimeIndex: two binary searches
+                log = history.loc[pd.Timestamp(start) if start else None:
+                                  pd.Timestamp(end) if end else None]
+            window = Window(log, SessionIndex(log), summary_window(summary, start, end))
+            self.windows.put(key, window)
+
+        return window
+
+    def _compute(self, endpoint, loaded, fingerprint, query):
+        window = self._window(loaded, fingerprint, query["start"], query["end"])
+
+        if window.log.empty:
+            raise NotFound("No workouts logged in this range")
+
+        return _encode(ENDPOINTS[endpoint](window, query))
+
+    async def result(self, endpoint, query):
+        """
+        Encoded JSON body for one endpoint, from cache when warm.
+        """
+        fingerprint, loaded = await self.history(query["athlete"])
+
+        if loaded[0].empty:
+            raise NotFound(f"No workouts logged for athlete {query['athlete']!r}")
+
+        # readiness is relative to today, so keys turn over at midnight
+        window = query["window"] if endpoint == "/aggregate" else None
+        key = (
+            fingerprint, endpoint, query["start"], query["end"], window,
+            datetime.date.today()
+        )
+
+        body = self.responses.get(key)
+        if body is None:
+            body = await self._run(key, self._compute, endpoint, loaded, fingerprint, query)
+            self.responses.put(key, body)
+
+        return body
+
+    def health(self):
+        return _encode({
+            "logs": {
+                athlete: {"rows": len(history), "summary_rows": len(summary), "sha256": fingerprint[3]}
+                for athlete, (fingerprint, (history, summary)) in self.logs.items()
+            },
+            "cache": {
+                "entries": len(self.responses),
+                "bytes": self.responses.nbytes,
+                "hits": self.responses.hits,
+                "misses": self.responses.misses,
+            },
+        })
+
+    async def warm(self, athlete):
+        """
+        Loads the athlete's log and computes every endpoint's default
+        (whole history) query.
+        """
+        query = parse_query(f"athlete={athlete}")
+
+        for endpoint in ENDPOINTS:
+            try:
+                await self.result(endpoint, query)
+            except NotFound:
+                return
+
+    async def poll(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+
+            for athlete, (fingerprint, _) in list(self.logs.items()):
+                try:
+                    if await self.fingerprint(athlete) == fingerprint:
+                        continue
+                    await self.warm(athlete)
+                except FileNotFoundError:
+                    self._forget(athlete)
+                except Exception:
+                    traceback.print_exc()
+
+    # ---------- HTTP ----------
+
+    async def dispatch(self, method, target):
+        """
+        (status, body) for one request.
+        """
+        if method != "GET":
+            return 405, _encode({"error": "Only GET is supported"})
+
+        url = urlsplit(target)
+
+        try:
+            if url.path == "/health":
+                return 200, self.health()
+            if url.path not in ENDPOINTS:
+                raise NotFound(f"Unknown endpoint {url.path!r}")
+
+            return 200, await self.result(url.path, parse_query(url.query))
+
+        except NotFound as error:
+            return 404, _encode({"error": str(error)})
+        except ValueError as error:
+            return 400, _encode({"error": str(error)})
+        except Exception as error:
+            traceback.print_exc()
+            return 500, _encode({"error": f"{type(error).__name__}: {error}"})
+
+    async def handle(self, reader, writer):
+        """
+        One connection: HTTP/1.1 keep-alive, requests answered in order.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (line.partition(":") for line in lines[1:] if line)
+                }
+
+                try:
+                    method, target, version = lines[0].split(" ")
+                    body_length = int(headers.get("content-length", 0))
+                    if body_length < 0:
+                        raise ValueError(body_length)
+                except ValueError:
+                    writer.write(_response(400, _encode({"error": "Malformed request"}), False))
+                    break
+
+                if body_length:
+                    await reader.readexactly(body_length)
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (
+                    version == "HTTP/1.1" and connection != "close"
+                )
+
+                status, body = await self.dispatch(method, target)
+                writer.write(_response(status, body, keep_alive))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _response(status, body, keep_alive):
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode() + body
+
+
+async def serve(host=HOST, port=PORT, path=CSV_PATH, backend=STORAGE_BACKEND,
+                poll_seconds=POLL_SECONDS, warm=True):
+    service = AnalyticsService(path, backend, poll_seconds)
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_BYTES)
+
+    if warm:
+        for athlete in list_athletes(path, backend):
+            await service.warm(athlete)
+
+    # port 0 picks a free port; report the real one (bench/load.py reads it)
+    port = server.sockets[0].getsockname()[1]
+    print(f"Serving on http://{host}:{port}", flush=True)
+
+    poller = asyncio.create_task(service.poll())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        poller.cancel()
+        service.executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workout analytics HTTP service")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--path", default=CSV_PATH)
+    parser.add_argument("--backend", default=STORAGE_BACKEND)
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS,
+                        help="seconds between checks for changed logs")
+    parser.add_argument("--no-warm", action="store_true", help="skip precomputing at startup")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(
+            args.host, args.port, args.path, args.backend,
+            poll_seconds=args.poll, warm=not args.no_warm
+        ))
+    except KeyboardInterrupt:
+        print("Stopped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+# storage.py
+"""
+Storage backends for the workout log.
+
+csv     : one append-only CSV file (default)
+parquet : a directory with one partition per month,
+          <root>/month=YYYY-MM/part-*.parquet (needs pyarrow)
+
+Both expose append(df), load(start, end, routines) and
+iter_batches(chunksize, start, end, routines) for bounded-memory reads.
+The parquet backend only opens the month partitions that overlap
+the requested date range and pushes the routine filter into the reader.
+
+CSV appends are safe with several writer processes (kiosk terminals):
+each flush takes an exclusive file lock, repairs a torn tail left by a
+crashed writer, decides on the header under the lock and writes the
+whole batch with one O_APPEND write. Concurrent appends within a
+process are group-committed into a single flush.
+
+Logs are partitioned per athlete. The default athlete keeps the legacy
+location; every other athlete gets its own file / directory (see
+athlete_path). The athlete column is implied by the partition: it is
+dropped on write and restored on load.
+
+Migrate an existing CSV log:
+    python storage.py migrate workout_log.csv workout_log/
+
+Rebuild / verify the per-session summary table (by default the
+<log>_sessions.csv beside the log):
+    python storage.py summary-rebuild workout_log.csv
+    python storage.py summary-check workout_log.csv [workout_log_sessions.csv]
+"""
+import io
+import os
+import argparse
+import threading
+import uuid
+import pandas as pd
+
+from csvlog import (
+    DEFAULT_ATHLETE,
+    HeaderMismatch,
+    athlete_path,
+    check_header,
+    locked_append,
+    repair_csv,
+    resolve_summary_path
+)
+
+
+# ==============================
+# DATE ENCODING
+# ==============================
+# Dates are written as ISO YYYY-MM-DD only, so reads take the
+# fixed-format parser; older free-form rows fall back to inference.
+
+ISO_DATE = "%Y-%m-%d"
+
+
+def parse_log_dates(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    dates = pd.to_datetime(values, format=ISO_DATE, errors="coerce")
+    retry = dates.isna() & values.notna()
+
+    if retry.any():
+        dates[retry] = pd.to_datetime(
+            values[retry], format="mixed", errors="coerce"
+        ).dt.normalize()
+
+    return dates
+
+
+def canonical_dates(df):
+    """
+    Copy of `df` with the date column as midnight datetime64, written
+    out as ISO_DATE.
+    """
+    dates = df["date"]
+
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates.astype(str), format="mixed")
+
+    return df.assign(date=dates.dt.normalize())
+
+
+def date_indexed(log_df):
+    """
+    Sorted by date (stable) on an unnamed DatetimeIndex, so date ranges
+    are index slices; the date column is kept for the engine. Rows whose
+    date did not parse are dropped (NaT would break the sort order).
+    """
+    if log_df.empty:
+        return log_df
+
+    valid = log_df["date"].notna()
+    if not valid.all():
+        log_df = log_df[valid]
+
+    if not log_df["date"].is_monotonic_increasing:
+        log_df = log_df.sort_values("date", kind="stable")
+
+    log_df.index = pd.DatetimeIndex(log_df["date"].to_numpy())
+    return log_df
+
+
+def filter_log(log_df, start=None, end=None, routines=None):
+    if log_df.empty or (start is None and end is None and routines is None):
+        return log_df
+
+    mask = pd.Series(True, index=log_df.index)
+
+    if start is not None:
+        mask &= log_df["date"] >= pd.to_datetime(start)
+    if end is not None:
+        mask &= log_df["date"] <= pd.to_datetime(end)
+    if routines is not None:
+        mask &= log_df["routine"].isin(list(routines))
+
+    return log_df[mask].reset_index(drop=True)
+
+
+# ==============================
+# CONCURRENT CSV APPENDS
+# ==============================
+
+def _flush_csv(path, frames, fsync=True):
+    batch = pd.concat(frames, ignore_index=True)
+
+    def encode(header):
+        # same columns as on disk, in the file's order
+        check_header(header, batch.columns)
+        rows = batch if header is None else batch[header]
+
+        buffer = io.StringIO()
+        rows.to_csv(buffer, header=header is None, index=False, date_format=ISO_DATE)
+        return buffer.getvalue().encode()
+
+    locked_append(path, encode, fsync)
+
+
+class _GroupCommit:
+    """
+    Per-path commit queue: threads that append while a flush is in
+    progress are written together by the next flusher.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.queue_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.pending = []
+
+    def append(self, df, fsync=True):
+        entry = {"df": df, "done": threading.Event(), "error": None}
+
+        with self.queue_lock:
+            self.pending.append(entry)
+
+        with self.flush_lock:
+            with self.queue_lock:
+                batch, self.pending = self.pending, []
+
+            if batch:
+                try:
+                    _flush_csv(self.path, [e["df"] for e in batch], fsync)
+                except Exception as error:
+                    for e in batch:
+                        e["error"] = error
+                    raise
+                finally:
+                    for e in batch:
+                        e["done"].set()
+
+        entry["done"].wait()
+        if entry["error"] is not None:
+            raise entry["error"]
+
+
+_COMMITTERS = {}
+_COMMITTERS_LOCK = threading.Lock()
+
+
+def append_csv(path, df, fsync=True):
+    """
+    Appends rows to a CSV log: locked, torn-tail safe, group-committed.
+    """
+    if df.empty:
+        return
+
+    key = os.path.abspath(path)
+
+    with _COMMITTERS_LOCK:
+        committer = _COMMITTERS.setdefault(key, _GroupCommit(key))
+
+    committer.append(df, fsync)
+
+
+# ==============================
+# CSV BACKEND
+# ==============================
+
+class CsvStorage:
+
+    def __init__(self, path, athlete=DEFAULT_ATHLETE):
+        self.path = path
+        self.athlete = athlete
+
+    def append(self, df):
+        if df.empty:
+            return
+        append_csv(self.path, canonical_dates(df.drop(columns="athlete", errors="ignore")))
+
+    def load(self, start=None, end=None, routines=None):
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+
+        log_df = pd.read_csv(self.path, dtype={"date": str})
+        log_df["date"] = parse_log_dates(log_df["date"])
+        return with_athlete(filter_log(log_df, start, end, routines), self.athlete)
+
+    def iter_batches(self, chunksize=100_000, start=None, end=None, routines=None):
+        if not os.path.exists(self.path):
+            return
+
+        for chunk in pd.read_csv(self.path, dtype={"date": str}, chunksize=chunksize):
+            chunk["date"] = parse_log_dates(chunk["date"])
+            chunk = filter_log(chunk, start, end, routines)
+
+            if not chunk.empty:
+                yield with_athlete(chunk, self.athlete)
+
+
+# ==============================
+# PARQUET BACKEND (MONTH PARTITIONS)
+# ==============================
+
+class ParquetStorage:
+
+    def __init__(self, root, athlete=DEFAULT_ATHLETE):
+        self.root = root
+        self.athlete = athlete
+
+    def partition_dir(self, month):
+        return os.path.join(self.root, f"month={month}")
+
+    def months(self):
+        if not os.path.isdir(self.root):
+            return []
+
+        return sorted(
+            name.split("=", 1)[1]
+            for name in os.listdir(self.root)
+            if name.startswith("month=")
+        )
+
+    def append(self, df):
+        if df.empty:
+            return
+
+        df = canonical_dates(df.drop(columns="athlete", errors="ignore"))
+
+        for month, part in df.groupby(df["date"].dt.strftime("%Y-%m")):
+            folder = self.partition_dir(month)
+            os.makedirs(folder, exist_ok=True)
+
+            # write-then-rename: readers never see a half-written part
+            target = os.path.join(folder, f"part-{uuid.uuid4().hex}.parquet")
+            part.to_parquet(target + ".tmp", index=False)
+            os.replace(target + ".tmp", target)
+
+    def _pruned_months(self, start=None, end=None):
+        months = self.months()
+
+        # partition pruning: YYYY-MM strings sort chronologically
+        if start is not None:
+            first = pd.to_datetime(start).strftime("%Y-%m")
+            months = [m for m in months if m >= first]
+        if end is not None:
+            last = pd.to_datetime(end).strftime("%Y-%m")
+            months = [m for m in months if m <= last]
+
+        return months
+
+    def _files(self, months):
+        for month in months:
+            folder = self.partition_dir(month)
+
+            for name in sorted(os.listdir(folder)):
+                if name.endswith(".parquet"):
+                    yield os.path.join(folder, name)
+
+    def load(self, start=None, end=None, routines=None):
+        months = self._pruned_months(start, end)
+
+        filters = []
+        if start is not None:
+            filters.append(("date", ">=", pd.to_datetime(start)))
+        if end is not None:
+            filters.append(("date", "<=", pd.to_datetime(end)))
+        if routines is not None:
+            filters.append(("routine", "in", list(routines)))
+
+        parts = [
+            pd.read_parquet(file, filters=filters or None)
+            for file in self._files(months)
+        ]
+
+        parts = [p for p in parts if not p.empty]
+
+        if not parts:
+            return pd.DataFrame()
+
+        log_df = (
+            pd.concat(parts, ignore_index=True)
+            .sort_values("date", kind="stable")
+            .reset_index(drop=True)
+        )
+
+        return with_athlete(log_df, self.athlete)
+
+    def iter_batches(self, chunksize=100_000, start=None, end=None, routines=None):
+        import pyarrow.parquet as pq
+
+        for file in self._files(self._pruned_months(start, end)):
+            for record_batch in pq.ParquetFile(file).iter_batches(batch_size=chunksize):
+                chunk = filter_log(record_batch.to_pandas(), start, end, routines)
+
+                if not chunk.empty:
+                    yield with_athlete(chunk, self.athlete)
+
+
+BACKENDS = {
+    "csv": CsvStorage,
+    "parquet": ParquetStorage,
+}
+
+
+def with_athlete(log_df, athlete):
+    if log_df.empty or "athlete" in log_df.columns:
+        return log_df
+
+    log_df.insert(0, "athlete", athlete)
+    return log_df
+
+
+# ==============================
+# PER-ATHLETE PARTITIONS
+# ==============================
+
+def list_athletes(path, backend="csv"):
+    athletes = []
+
+    if backend == "parquet":
+        if ParquetStorage(path).months():
+            athletes.append(DEFAULT_ATHLETE)
+
+        if os.path.isdir(path):
+            athletes += sorted(
+                name.split("=", 1)[1]
+                for name in os.listdir(path)
+                if name.startswith("athlete=")
+            )
+
+        return athletes
+
+    if os.path.exists(path):
+        athletes.append(DEFAULT_ATHLETE)
+
+    folder, name = os.path.split(path)
+    athletes_dir = os.path.join(folder, "athletes")
+
+    if os.path.isdir(athletes_dir):
+        athletes += sorted(
+            a for a in os.listdir(athletes_dir)
+            if os.path.exists(os.path.join(athletes_dir, a, name))
+        )
+
+    return athletes
+
+
+def open_storage(path, backend="csv", athlete=None):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    return BACKENDS[backend](
+        athlete_path(path, athlete, backend),
+        athlete or DEFAULT_ATHLETE
+    )
+
+
+# ==============================
+# CSV → PARQUET MIGRATION
+# ==============================
+
+def migrate_csv(csv_path, root, chunksize=500_000):
+    """
+    Copies a CSV log, including every per-athlete partition next to it,
+    into a month-partitioned parquet directory. Rows carrying their own
+    athlete column are split by it. Returns the number of rows written.
+    """
+    rows = 0
+
+    for athlete in list_athletes(csv_path):
+        source = athlete_path(csv_path, athlete)
+
+        for chunk in pd.read_csv(source, dtype={"date": str}, chunksize=chunksize):
+            chunk["date"] = parse_log_dates(chunk["date"])
+
+            if "athlete" in chunk.columns:
+                for chunk_athlete, part in chunk.groupby("athlete"):
+                    open_storage(root, "parquet", chunk_athlete).append(part)
+            else:
+                open_storage(root, "parquet", athlete).append(chunk)
+
+            rows += len(chunk)
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workout log storage tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="convert a CSV log to parquet")
+    migrate.add_argument("csv_path")
+    migrate.add_argument("root")
+
+    for name, text in [
+        ("summary-rebuild", "recompute the session summary from the raw log"),
+        ("summary-check", "compare the session summary against the raw log"),
+    ]:
+        command = commands.add_parser(name, help=text)
+        command.add_argument("log_path")
+        command.add_argument("summary_path", nargs="?", default="auto",
+                             help="default: beside the log")
+        command.add_argument("--backend", default="csv", choices=sorted(BACKENDS))
+        command.add_argument("--athlete", default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        rows = migrate_csv(args.csv_path, args.root)
+        print(f"Migrated {rows} rows → {args.root}")
+
+    # logger imports this module, so import it lazily here
+    elif args.command == "summary-rebuild":
+        from logger import rebuild_session_summary
+        rows = rebuild_session_summary(
+            args.log_path, args.summary_path, args.backend, args.athlete
+        )
+        print(f"Wrote {rows} summary rows → {resolve_summary_path(args.log_path, args.summary_path)}")
+
+    elif args.command == "summary-check":
+        from logger import verify_session_summary
+        mismatches = verify_session_summary(
+            args.log_path, args.summary_path, args.backend, args.athlete
+        )
+
+        if mismatches.empty:
+            print("Summary is consistent with the raw log.")
+        else:
+            print(mismatches.to_string(index=False))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
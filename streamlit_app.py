@@ -1,21 +1,20 @@
+import datetime
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
-from logger import load_history
+from logger import CSV_PATH, SUMMARY_PATH, current_session_summary, load_history
+from cache import file_fingerprint, memoize
+from charts import line_chart, radar_chart, render_cache_stats
 
 # ---- CORE ----
 from engine.core import (
     compute_muscle_contribution,
-    collapse_to_tier1,
-    muscle_coverage_report
+    collapse_to_tier1
 )
 
 # ---- AGGREGATION ----
 from engine.aggregation import (
-    aggregate_by_sessions,
-    aggregate_routine_by_sessions,
     exercise_wise_push_pull
 )
 
@@ -25,9 +24,24 @@ from engine.recovery import (
 )
 
 # ---- ANALYSIS ----
-from engine.analysis import (
-    imbalance_flags,
-    coverage_completeness_score
+from engine.analysis import analysis_report
+
+# ---- ROLLING ----
+from engine.rolling import rolling_session_totals
+
+# ---- WORKLOAD ----
+from engine.config import ACWR_SPIKE
+from engine.workload import workload_series, acwr_status
+
+# ---- PROFILING ----
+from engine import profiling
+
+# ---- SESSIONS ----
+from engine.sessions import SessionIndex
+from engine.summary import (
+    aggregate_summary_by_sessions,
+    aggregate_summary_routine_by_sessions,
+    summary_window
 )
 
 # ---- Progress ----
@@ -43,6 +57,107 @@ from engine.progress import (
 BODYWEIGHT_KG = 63
 
 
+# ==============================
+# CACHED COMPUTATIONS
+# ==============================
+# Keyed on the log fingerprint (size, mtime, content hash) plus the
+# filter arguments, so a widget change only recomputes what it affects.
+# Cached results are shared across reruns and must not be mutated.
+
+@memoize(maxsize=4)
+def parsed_history(fingerprint):
+    # typed dates, sorted on a DatetimeIndex
+    return load_history(fingerprint[0])
+
+
+@memoize(maxsize=16)
+def filter_history(fingerprint, start, end):
+    history = parsed_history(fingerprint)
+
+    # sorted-index slice: two binary searches, no row mask
+    return history.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+
+@memoize(maxsize=16)
+def tier1_scores(fingerprint, start, end):
+    fine_scores = compute_muscle_contribution(filter_history(fingerprint, start, end))
+    tier1_df = collapse_to_tier1(fine_scores)
+    tier1_df["Normalized"] = tier1_df["Intensity Score"] / BODYWEIGHT_KG
+
+    return fine_scores, tier1_df
+
+
+@memoize(maxsize=16)
+def group_report(fingerprint, start, end):
+    # every Tier-1 group at once, so the coverage selectbox is a lookup
+    fine_scores, tier1_df = tier1_scores(fingerprint, start, end)
+    report = analysis_report(fine_scores)
+
+    report["imbalance"]["Normalized"] = report["imbalance"]["Intensity Score"] / BODYWEIGHT_KG
+    return report
+
+
+@memoize(maxsize=16)
+def push_pull_volume(fingerprint, start, end):
+    return exercise_wise_push_pull(filter_history(fingerprint, start, end))
+
+
+@memoize(maxsize=16)
+def readiness(fingerprint, start, end, today):
+    return unified_muscle_readiness(filter_history(fingerprint, start, end))
+
+
+@memoize(maxsize=16)
+def workload(fingerprint, end):
+    # whole history up to `end`: the chronic EMA needs the lead-in
+    history = parsed_history(fingerprint)
+    return workload_series(history, end=end), acwr_status(history, reference_date=end)
+
+
+@memoize(maxsize=16)
+def history_sessions(fingerprint, start, end):
+    return SessionIndex(filter_history(fingerprint, start, end))
+
+
+@memoize(maxsize=4)
+def session_summary(fingerprint, summary_fingerprint):
+    # stored per-session rows (rebuilt in memory if stale or missing)
+    return current_session_summary(parsed_history(fingerprint), fingerprint[0])
+
+
+@memoize(maxsize=32)
+def session_aggregates(fingerprint, summary_fingerprint, start, end, window_name):
+    # last-N windows read N sessions' summary rows, not exercise rows
+    summary = summary_window(session_summary(fingerprint, summary_fingerprint), start, end)
+
+    agg_df = aggregate_summary_by_sessions(summary, window_name=window_name)
+    agg_df["Normalized"] = agg_df["Intensity Score"] / BODYWEIGHT_KG
+
+    routine_df = aggregate_summary_routine_by_sessions(summary, window_name=window_name)
+    routine_df["Normalized"] = routine_df["Intensity Score"] / BODYWEIGHT_KG
+
+    return agg_df, routine_df
+
+
+@memoize(maxsize=16)
+def rolling_totals(fingerprint, start, end):
+    return rolling_session_totals(history_sessions(fingerprint, start, end))
+
+
+@memoize(maxsize=16)
+def current_from_logs(fingerprint, start, end):
+    return compute_current_from_logs(history_sessions(fingerprint, start, end))
+
+
+@memoize(maxsize=16)
+def progress_series(fingerprint, start, end):
+    return routine_progress_series(
+        filter_history(fingerprint, start, end),
+        BASELINE_ROUTINE,
+        window=3
+    )
+
+
 # ==============================
 # PAGE CONFIG
 # ==============================
@@ -52,6 +167,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# per-rerun timings (only recorded when WORKOUT_PROFILE is set)
+profiling.reset()
+
 st.title("🏋️ Workout Analytics Dashboard")
 st.caption("Relative muscle load • balance • readiness • routine overload")
 
@@ -60,55 +178,53 @@ st.caption("Relative muscle load • balance • readiness • routine overload"
 # LOAD DATA
 # ==============================
 
-history = load_history()
+profiling.checkpoint("Load data")
+
+history_key = file_fingerprint(CSV_PATH)
+summary_key = file_fingerprint(SUMMARY_PATH)
+history = parsed_history(history_key)
 
 if history.empty:
     st.warning("No workout data found. Log workouts first.")
     st.stop()
 
-history["date"] = pd.to_datetime(
-    history["date"],
-    format="mixed",
-    errors="coerce"
-)
-
 
 # ==============================
 # SIDEBAR FILTERS
 # ==============================
 
+profiling.checkpoint("Filters")
+
 st.sidebar.header("Filters")
 
 date_range = st.sidebar.date_input(
     "Select date range",
-    [history["date"].min(), history["date"].max()]
+    [history.index[0], history.index[-1]]
 )
 
 if len(date_range) != 2:
     st.stop()
 
-filtered = history[
-    (history["date"] >= pd.to_datetime(date_range[0])) &
-    (history["date"] <= pd.to_datetime(date_range[1]))
-]
+start_date, end_date = date_range
 
-st.sidebar.markdown(f"**Sessions:** {filtered['date'].nunique()}")
+st.sidebar.markdown(f"**Sessions:** {len(history_sessions(history_key, start_date, end_date))}")
 
 
 # ==============================
 # MUSCLE CONTRIBUTION
 # ==============================
 
-fine_scores = compute_muscle_contribution(filtered)
-tier1_df = collapse_to_tier1(fine_scores)
+profiling.checkpoint("Muscle contribution")
 
-tier1_df["Normalized"] = tier1_df["Intensity Score"] / BODYWEIGHT_KG
+fine_scores, tier1_df = tier1_scores(history_key, start_date, end_date)
 
 
 # ==============================
 # MAIN LAYOUT
 # ==============================
 
+profiling.checkpoint("Tables & radar")
+
 col1, col2 = st.columns([1.15, 1])
 
 # ---------- TABLE ----------
@@ -120,7 +236,8 @@ with col1:
         use_container_width=True
     )
 
-    imbalance_df = imbalance_flags(tier1_df.copy())
+    report = group_report(history_key, start_date, end_date)
+    imbalance_df = report["imbalance"]
 
     st.subheader("⚠️ Imbalance Detection")
     st.dataframe(
@@ -132,27 +249,20 @@ with col1:
 with col2:
     st.subheader("Muscle Balance Radar")
 
-    labels = tier1_df["Muscle Group"].tolist()
-    values = tier1_df["Normalized"].tolist()
-
-    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False)
-    values += values[:1]
-    angles = np.append(angles, angles[0])
-
-    fig = plt.figure(figsize=(5, 5))
-    ax = plt.subplot(111, polar=True)
-    ax.plot(angles, values)
-    ax.fill(angles, values, alpha=0.25)
-    ax.set_thetagrids(np.degrees(angles[:-1]), labels)
-    ax.set_title("Relative Muscle Balance")
-
-    st.pyplot(fig)
+    st.image(radar_chart(
+        tier1_df["Muscle Group"].tolist(),
+        tier1_df["Normalized"].tolist(),
+        title="Relative Muscle Balance",
+        size=(5, 5)
+    ))
 
 
 # ==============================
 # SUB-MUSCLE COVERAGE
 # ==============================
 
+profiling.checkpoint("Sub-muscle coverage")
+
 st.divider()
 st.subheader("🔍 Sub-Muscle Coverage")
 
@@ -161,17 +271,14 @@ target_group = st.selectbox(
     tier1_df["Muscle Group"].tolist()
 )
 
-coverage_df = muscle_coverage_report(fine_scores, target_group)
+coverage_df = report["coverage"].get(target_group, pd.DataFrame())
 
 if coverage_df.empty:
     st.info("No sub-muscle data.")
 else:
     st.dataframe(coverage_df, use_container_width=True)
 
-coverage_pct = coverage_completeness_score(
-    fine_scores,
-    target_group
-)
+coverage_pct = report["completeness"].get(target_group, 0.0)
 
 st.metric(
     f"{target_group} Coverage",
@@ -184,6 +291,8 @@ st.metric(
 # BALANCE RATIOS
 # ==============================
 
+profiling.checkpoint("Balance ratios")
+
 st.divider()
 st.subheader("⚖️ Training Balance Ratios")
 
@@ -205,7 +314,7 @@ upper = push_m + pull_m
 lower = lookup.get("Legs", 0) + lookup.get("Core", 0)
 
 # Exercise-wise (programming)
-push_e, pull_e = exercise_wise_push_pull(filtered)
+push_e, pull_e = push_pull_volume(history_key, start_date, end_date)
 
 c1, c2, c3 = st.columns(3)
 
@@ -232,10 +341,14 @@ c3.metric(
 # MUSCLE READINESS
 # ==============================
 
+profiling.checkpoint("Readiness")
+
 st.divider()
 st.subheader("🧠 Muscle Readiness")
 
-readiness_df = unified_muscle_readiness(filtered)
+readiness_df = readiness(
+    history_key, start_date, end_date, datetime.date.today()
+)
 
 st.dataframe(readiness_df, use_container_width=True)
 
@@ -252,10 +365,44 @@ for muscle, row in readiness_df.iterrows():
         st.success(f"{muscle}: Fully ready")
 
 
+# ==============================
+# ACUTE : CHRONIC WORKLOAD
+# ==============================
+
+profiling.checkpoint("Workload")
+
+st.divider()
+st.subheader("📉 Acute:Chronic Workload Ratio")
+
+workload_df, acwr_df = workload(history_key, end_date)
+
+st.dataframe(acwr_df.round(2), use_container_width=True)
+
+for muscle, row in acwr_df.iterrows():
+    if row["Status"] == "Spike risk":
+        st.error(f"{muscle}: load spike (ACWR {row['ACWR']:.2f})")
+
+# last 90 days of the selected range
+recent_acwr = workload_df["acwr"].loc[pd.Timestamp(start_date):].tail(90)
+
+if recent_acwr.notna().any().any():
+    st.image(line_chart(
+        {group: recent_acwr[group] for group in recent_acwr.columns},
+        title=f"ACWR per Tier-1 Group (spike above {ACWR_SPIKE})",
+        xlabel="Day",
+        ylabel="Acute / Chronic",
+        baseline=ACWR_SPIKE
+    ))
+else:
+    st.info("Not enough history for ACWR (needs 4 weeks).")
+
+
 # ==============================
 # SESSION-BASED AGGREGATION
 # ==============================
 
+profiling.checkpoint("Session aggregation")
+
 st.divider()
 aggregation_mode = st.selectbox(
     "Aggregation window",
@@ -269,28 +416,35 @@ mode_map = {
 
 st.subheader(f"📊 {aggregation_mode} — Muscle Contribution")
 
-agg_df = aggregate_by_sessions(
-    filtered,
-    window_name=mode_map[aggregation_mode]
+agg_df, routine_df = session_aggregates(
+    history_key, summary_key, start_date, end_date, mode_map[aggregation_mode]
 )
 
-agg_df["Normalized"] = agg_df["Intensity Score"] / BODYWEIGHT_KG
-
 st.dataframe(agg_df, use_container_width=True)
 
 
+# ---------- ROLLING TRENDS ----------
+rolling = rolling_totals(history_key, start_date, end_date)
+
+if len(rolling.dates) > 1:
+    trend_group = st.selectbox("Trend muscle group", list(rolling.muscles))
+    trend_df = rolling.series(trend_group).tail(60)
+
+    st.image(line_chart(
+        {f"Last {w} sessions": trend_df[w] for w in rolling.windows},
+        title=f"{trend_group} — Rolling Session Totals",
+        xlabel="Session",
+        ylabel="Intensity"
+    ))
+
+
 # ==============================
 # ROUTINE OVERLOAD (NEW)
 # ==============================
 
-st.subheader(f"🏗 {aggregation_mode} — Routine Intensity")
-
-routine_df = aggregate_routine_by_sessions(
-    filtered,
-    window_name=mode_map[aggregation_mode]
-)
+profiling.checkpoint("Routine overload")
 
-routine_df["Normalized"] = routine_df["Intensity Score"] / BODYWEIGHT_KG
+st.subheader(f"🏗 {aggregation_mode} — Routine Intensity")
 
 st.dataframe(routine_df, use_container_width=True)
 
@@ -308,8 +462,11 @@ st.caption(
 # PROGRESS: BASELINE → CURRENT → FINAL
 # ==============================
 
+profiling.checkpoint("Progress")
+
+# fingerprint-checked, cached in memory and under config.CACHE_DIR
 final_muscle, final_routine = compute_final_target()
-current_muscle, current_routine = compute_current_from_logs(filtered)
+current_muscle, current_routine = current_from_logs(history_key, start_date, end_date)
 
 st.divider()
 st.subheader("📊 Muscle Intensity — Baseline vs Current vs Final")
@@ -367,48 +524,56 @@ st.dataframe(routine_progress_df, use_container_width=True)
 st.divider()
 st.subheader("📈 Routine Progression (Δ from Baseline)")
 
-progress_df = routine_progress_series(
-    filtered,
-    BASELINE_ROUTINE,
-    window=3
-)
+progress_df = progress_series(history_key, start_date, end_date)
 
 if progress_df.empty:
     st.info("Not enough sessions to show progression (need ≥3).")
 else:
-    # X-axis as session index
-    x = list(range(1, len(progress_df) + 1))
-
-    fig, ax = plt.subplots(figsize=(7, 4))
-
-    # Transparent backgrounds (Streamlit dark-mode friendly)
-    fig.patch.set_alpha(0)
-    ax.set_facecolor("none")
-
-    # Plot lines
-    ax.plot(x, progress_df["push"], label="Push", marker="o")
-    ax.plot(x, progress_df["pull"], label="Pull", marker="o")
-    ax.plot(x, progress_df["core"], label="Core", marker="o")
-
+    # Rendered headlessly; unchanged data reuses the cached PNG
+    st.image(line_chart(
+        {
+            "Push": progress_df["push"],
+            "Pull": progress_df["pull"],
+            "Core": progress_df["core"],
+        },
+        title="Routine-wise Progression (Last 3-Session Window)",
+        xlabel="Session Index",
+        ylabel="Δ Intensity vs Baseline",
+        baseline=0
+    ))
 
-    # Baseline reference line
-    ax.axhline(0, linestyle="--", linewidth=1, alpha=0.6)
 
-    # Axis labels & title (light text)
-    ax.set_xlabel("Session Index", color="#DDDDDD")
-    ax.set_ylabel("Δ Intensity vs Baseline", color="#DDDDDD")
-    ax.set_title("Routine-wise Progression (Last 3-Session Window)", color="#FFFFFF")
-
-    # Ticks styling
-    ax.tick_params(axis="x", colors="#CCCCCC")
-    ax.tick_params(axis="y", colors="#CCCCCC")
-
-    # Grid styling
-    ax.grid(True, alpha=0.2)
-
-    # Legend styling
-    legend = ax.legend()
-    for text in legend.get_texts():
-        text.set_color("#DDDDDD")
+# ==============================
+# PERFORMANCE (WORKOUT_PROFILE=1)
+# ==============================
 
-    st.pyplot(fig)
+if profiling.enabled():
+    profiling.close_section()
+
+    with st.expander("⏱ Performance", expanded=False):
+        sections_df = pd.DataFrame(profiling.section_timings())
+        if not sections_df.empty:
+            sections_df["ms"] = (sections_df["seconds"] * 1000).round(1)
+            st.dataframe(sections_df[["name", "ms"]], use_container_width=True)
+
+        functions_df = pd.DataFrame.from_dict(profiling.function_stats(), orient="index")
+        if not functions_df.empty:
+            functions_df["ms"] = (functions_df["seconds"] * 1000).round(1)
+            st.dataframe(
+                functions_df[["calls", "ms", "rows", "peak_bytes"]],
+                use_container_width=True
+            )
+
+        st.caption(
+            "Chart cache: {entries} renders, {bytes:,} bytes, "
+            "{hits} hits / {misses} misses".format(**render_cache_stats())
+        )
+
+        st.download_button(
+            "Export JSON", profiling.to_json(),
+            file_name="profile.json", mime="application/json"
+        )
+        st.download_button(
+            "Export Chrome trace", profiling.to_chrome_trace(),
+            file_name="trace.json", mime="application/json"
+        )